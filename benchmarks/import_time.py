@@ -0,0 +1,84 @@
+"""
+benchmarks/import_time.py
+-------------------------
+Import-time benchmark for CLI / batch-worker startup.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter
+and reports:
+- total cumulative import time of the target module
+- the heaviest transitive imports
+- whether any heavy SDK was pulled in eagerly (it should not be)
+
+Usage:
+    python -m benchmarks.import_time                 # run_match
+    python -m benchmarks.import_time core.jd_analyzer --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules that must only load when their stage runs
+HEAVY_MODULES = [
+    "google.generativeai",
+    "dotenv",
+    "fitz",
+    "numpy",
+    "sentence_transformers",
+    "torch",
+]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module: str) -> dict:
+    probe = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # "import time:  self [us] | cumulative | imported package"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    total = next((cum for name, _, cum in rows if name == module), 0)
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+
+    return {"total_us": total, "rows": rows, "heavy_loaded": heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of a module")
+    parser.add_argument("module", nargs="?", default="run_match")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [measure(args.module) for _ in range(args.runs)]
+    totals = sorted(r["total_us"] for r in results)
+    best = results[[r["total_us"] for r in results].index(totals[0])]
+
+    print(f"import {args.module}")
+    print(f"  best   : {totals[0] / 1000:.1f} ms")
+    print(f"  median : {totals[len(totals) // 2] / 1000:.1f} ms  ({args.runs} runs)")
+    print(f"  heavy modules loaded eagerly: {best['heavy_loaded'] or 'none'}")
+    print(f"\n  top {args.top} cumulative imports:")
+    for name, _, cum in sorted(best["rows"], key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"    {cum / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+benchmarks/jd_preprocess_throughput.py
+--------------------------------------
+JD preprocessing throughput (lines/sec).
+
+Compares, over the same corpus:
+- legacy   : copy of the original preprocessor (new processor per JD,
+             one re.search per noise pattern per line)
+- current  : preprocess_jd() per JD (verbose, with debug logging off)
+- batch    : preprocess_many() in-process (one shared quiet processor)
+- parallel : preprocess_many(workers=N) across processes
+
+Outputs of legacy and current are checked to be identical.
+
+The corpus is either a folder of .txt JDs or the sample JD repeated
+with per-copy variations.
+
+Usage:
+    python -m benchmarks.jd_preprocess_throughput
+    python -m benchmarks.jd_preprocess_throughput --corpus jds/ --workers 8
+"""
+
+import argparse
+import os
+import re
+import time
+from typing import List
+
+import config.settings
+from config.settings import STOPWORDS, debug_log
+from core.jd_preprocessor import preprocess_jd, preprocess_many
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_JD = os.path.join(REPO_ROOT, "data", "samples", "sample_jd.txt")
+
+
+def load_corpus(path: str, copies: int) -> List[str]:
+    if path and os.path.isdir(path):
+        texts = []
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.endswith(".txt"):
+                    with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                        texts.append(f.read())
+        return texts
+
+    with open(path or SAMPLE_JD, "r", encoding="utf-8") as f:
+        base = f.read()
+    return [f"Job ID: {i}\nLocation: Office {i % 50}\n{base}" for i in range(copies)]
+
+
+# ---------------------------------------------------------
+# Legacy implementation (verbatim logic of the original module)
+# ---------------------------------------------------------
+
+class _LegacyJDPreprocessor:
+
+    def __init__(self):
+        self.bullet_pattern = re.compile(r"^[•\-▪–·\*]\s*")
+        self.whitespace_pattern = re.compile(r"\s+")
+        self.section_header_pattern = re.compile(
+            r"(?i)^(responsibilities|requirements|qualifications|about the job|overview)\b"
+        )
+        self.force_tool_terms = {"python"}
+
+    def preprocess(self, text: str) -> str:
+        debug_log("Starting JD preprocessing...")
+
+        if not text or len(text.strip()) == 0:
+            return ""
+
+        cleaned_lines = []
+        seen = set()
+
+        for line in text.split("\n"):
+            original = line
+            line = line.strip()
+            if not line:
+                continue
+
+            line = self.bullet_pattern.sub("", line)
+            line = self.whitespace_pattern.sub(" ", line)
+
+            if self._is_noise(line):
+                continue
+
+            if self.section_header_pattern.match(line.lower()):
+                line = line.title()
+
+            lowered = line.lower()
+            for term in self.force_tool_terms:
+                if f"{term}" in lowered:
+                    debug_log(f"Found special skill '{term}' in JD → normalized")
+                    break
+
+            if line.lower() in seen:
+                continue
+
+            seen.add(line.lower())
+            cleaned_lines.append(line)
+            debug_log(f"Processed line: {original} → {line}")
+
+        cleaned_text = "\n".join(cleaned_lines)
+        debug_log("JD preprocessing complete.")
+        return cleaned_text
+
+    def _is_noise(self, line: str) -> bool:
+        noise_patterns = [
+            r"^apply now",
+            r"^click here",
+            r"equal opportunity employer",
+            r"drug free workplace",
+            r"terms and conditions",
+            r"privacy policy",
+            r"job id[: ]",
+            r"salary[: ]",
+        ]
+
+        for pattern in noise_patterns:
+            if re.search(pattern, line, re.IGNORECASE):
+                debug_log(f"Removed noise line: {line}")
+                return True
+
+        tokens = [t for t in line.lower().split() if t not in STOPWORDS]
+        if len(tokens) == 0:
+            debug_log(f"Removed stopword-only line: {line}")
+            return True
+
+        if len(line) < 3:
+            debug_log(f"Removed very short line: {line}")
+            return True
+
+        return False
+
+
+def legacy_preprocess_jd(text: str) -> str:
+    return _LegacyJDPreprocessor().preprocess(text)
+
+
+def _timed(fn, repeat: int) -> float:
+    """Best of `repeat` runs (least disturbed by other load)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure JD preprocessing throughput")
+    parser.add_argument("--corpus", default=None, help="Folder of .txt JDs or a single JD file")
+    parser.add_argument("--copies", type=int, default=2000, help="Synthetic corpus size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    # Measure the work, not stdout
+    config.settings.DEBUG = False
+
+    texts = load_corpus(args.corpus, args.copies)
+    n_lines = sum(t.count("\n") + 1 for t in texts)
+    print(f"corpus: {len(texts)} JDs, {n_lines} lines")
+
+    if [legacy_preprocess_jd(t) for t in texts] != [preprocess_jd(t) for t in texts]:
+        raise SystemExit("❌ current preprocessor output differs from legacy")
+
+    runs = [
+        ("legacy", lambda: [legacy_preprocess_jd(t) for t in texts]),
+        ("current", lambda: [preprocess_jd(t) for t in texts]),
+        ("batch", lambda: preprocess_many(texts)),
+    ]
+    if args.workers > 1:
+        runs.append((f"parallel×{args.workers}", lambda: preprocess_many(texts, workers=args.workers)))
+
+    for name, fn in runs:
+        seconds = _timed(fn, args.repeat)
+        print(f"  {name:<12} {seconds:7.3f}s  {n_lines / seconds:12,.0f} lines/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,128 @@ GEMINI_MODEL_EMBEDDINGS = "gemini-embedding-001"
 # Token limits
 MAX_TOKENS_JD = 2048
 MAX_TOKENS_RESUME = 4096
+MAX_TOKENS_RESUME_PACKED = 8192   # output budget when sections are packed
+
+# ============================================================
+# 🔧 LLM BACKEND
+# ============================================================
+
+# "gemini" | "local" (rule-based, offline) | "replay" (recorded responses
+# from the LLM cache) | "fake" (local + LLM_FAKE_LATENCY, for hedging tests).
+# Env override: MATCHMYJD_LLM_BACKEND
+LLM_BACKEND = "gemini"
+
+# Backend used on replay misses (None → raise)
+LLM_REPLAY_FALLBACK = None
+
+# Shared scheduler for Gemini calls (core/llm_scheduler.py).
+# rpm / tpm should match the project's quota tier (None → unlimited).
+LLM_RATE_LIMITS = {
+    "enabled": True,
+    "rpm": 60,
+    "tpm": 1_000_000,
+    "output_token_estimate": 1024,     # expected output tokens per call
+    "initial_concurrency": 4,
+    "min_concurrency": 1,
+    "max_concurrency": 16,
+    "decrease_factor": 0.5,            # AIMD multiplicative decrease on 429
+    "max_retries": 5,
+    "backoff_base_seconds": 1.0,
+    "backoff_max_seconds": 60.0
+}
+
+# Hard per-request timeout passed to the Gemini SDK (seconds)
+LLM_CALL_TIMEOUT_SECONDS = 60
+
+# Budget per scheduled LLM call, queueing + backoff + retries included;
+# SDK timeouts of later attempts are capped at the time left (seconds)
+LLM_CALL_DEADLINE_SECONDS = 120
+
+# Hedged requests (core/llm_hedging.py): after the rolling `percentile`
+# latency, send one duplicate and take the first response.
+# Extra requests are capped at max_extra_ratio of all requests; the
+# hedge percentile is never below 100 × (1 − max_extra_ratio).
+LLM_HEDGING = {
+    "enabled": False,
+    "percentile": 95,
+    "window": 200,                     # recent successful latencies kept
+    "min_samples": 20,                 # before that, initial_delay_seconds
+    "initial_delay_seconds": 5.0,
+    "min_delay_seconds": 0.5,
+    "max_extra_ratio": 0.1,
+    "timeout_seconds": 60.0,           # hard deadline per hedged call, retries included
+    "max_workers": 16
+}
+
+# Injected latency for the "fake" backend (offline hedging / load tests)
+LLM_FAKE_LATENCY = {
+    "median_seconds": 2.0,
+    "tail_probability": 0.05,
+    "tail_seconds": 20.0
+}
+
+# ============================================================
+# 🔧 LLM RESPONSE CACHE
+# ============================================================
+
+# Content-addressed on-disk cache for Gemini responses
+# (set MATCHMYJD_NO_CACHE=1 to bypass at runtime)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = ".cache/llm_cache.sqlite"
+LLM_CACHE_TTL_SECONDS = 30 * 24 * 3600   # None → never expire
+LLM_CACHE_MAX_ENTRIES = 50_000           # None → unbounded
+
+# ============================================================
+# 🔧 LLM RESPONSE HANDLING
+# ============================================================
+
+# Stream Gemini responses into an incremental JSON parser: stop at the
+# closing brace and repair truncated output instead of re-calling.
+LLM_STREAM_RESPONSES = True
+
+# Gemini structured output: JSON mime type for every call, plus the
+# response schema converted from schemas/*.json where Gemini can express it
+STRUCTURED_OUTPUT = True
+
+# ============================================================
+# 🔧 RESUME ANALYSIS EXECUTION
+# ============================================================
+
+# Max parallel per-section Gemini calls in analyze_resume (1 → sequential)
+RESUME_ANALYSIS_CONCURRENCY = 6
+
+# "sections" → one call per section
+# "packed"   → sections packed into one prompt up to MAX_TOKENS_RESUME
+#              (fewer requests per resume; best when RPM-bound)
+RESUME_ANALYSIS_MODE = "sections"
+
+# ============================================================
+# 🔧 SEMANTIC MATCHING (EMBEDDINGS)
+# ============================================================
+
+SEMANTIC_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Texts per encoder forward pass (tune per CPU/GPU)
+EMBEDDING_BATCH_SIZE = 64
+
+# Two-tier embedding cache: in-process LRU + memory-mapped vector file
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_DIR = ".cache/embeddings"
+EMBEDDING_CACHE_LRU_SIZE = 50_000
+EMBEDDING_CACHE_DTYPE = "float32"   # "float16" halves disk + page cache use
+
+# ANN (IVF) index over pooled resume vectors
+RESUME_INDEX = {
+    "n_lists": None,        # None → ~sqrt(N) clusters at build time
+    "n_probe": 8,           # clusters scanned per query (recall vs speed)
+    "shortlist_factor": 4   # ANN shortlist = k * factor before full scoring
+}
+
+# Cascading per-skill matcher (exact → fuzzy → semantic)
+CASCADE_MATCHING = {
+    "fuzzy_threshold": 0.5,      # token Jaccard needed to accept a fuzzy match
+    "semantic_threshold": 0.75   # cosine needed to accept a semantic match
+}
 
 # ============================================================
 # 🔧 SCORING CONFIGURATION (CURRENT PIPELINE)
@@ -29,10 +151,27 @@ HYBRID_SCORING = {
     "must_have_weight": 0.55,
     "semantic_weight": 0.30,
     "base_floor": 0.15,
+    "semantic_floor": 0.35,          # semantic safety net
+    "nice_to_have_step": 0.05,       # bonus per matched nice-to-have skill
     "nice_to_have_max_bonus": 0.15,
+    "evidence_strong_min": 4,        # skills with ≥2 pieces of evidence
+    "evidence_strong_boost": 1.12,
+    "evidence_some_min": 2,
+    "evidence_some_boost": 1.07,
     "min_final_score": 35
 }
 
+# Used INSIDE matcher_semantic to blend its two similarity signals
+SEMANTIC_SCORING = {
+    "responsibilities_weight": 0.65,   # JD responsibilities vs projects/evidence
+    "skills_weight": 0.35              # JD skills vs resume skills/tools
+}
+
+# Per-pair intermediate features, so weights can be re-tuned
+# and scores recomputed without Gemini or the encoder
+FEATURE_STORE_ENABLED = True
+FEATURE_STORE_PATH = ".cache/features.sqlite"
+
 # ============================================================
 # 🔧 LEGACY MATCHING CONFIG (KEPT FOR BACKWARD COMPAT)
 # ============================================================
@@ -78,6 +217,9 @@ STOPWORDS = {
     "and", "or", "the", "basic", "knowledge", "experience", "with"
 }
 
+# Memoized normalize_skill results (distinct raw skill strings)
+NORMALIZER_CACHE_SIZE = 100_000
+
 # ============================================================
 # 🔧 RESUME SECTION HEADERS
 # ============================================================
@@ -96,6 +238,56 @@ RESUME_SECTIONS = [
     "activities",
 ]
 
+# ============================================================
+# 🔧 BULK INGESTION
+# ============================================================
+
+# Process-pool size for bulk PDF parsing (None → os.cpu_count())
+BULK_INGEST_WORKERS = None
+
+# ============================================================
+# 🔧 JD BOILERPLATE MODEL
+# ============================================================
+
+# Lines seen in ≥ threshold of a company's (or the corpus's) JDs are
+# stripped before the prompt is built; lines naming a known skill are
+# always kept. Learn with:
+#   python -m core.jd_boilerplate learn <corpus_dir>
+BOILERPLATE = {
+    "enabled": True,
+    "path": ".cache/jd_boilerplate.json",
+    "company_threshold": 0.6,
+    "corpus_threshold": 0.6,       # well above the share of shared requirement lines
+    "min_company_docs": 3,
+    "min_corpus_docs": 20,
+    "min_line_chars": 40
+}
+
+# ============================================================
+# 🔧 INGESTION DEDUPE
+# ============================================================
+
+# Content-hash index of parsed / analyzed resumes and JDs
+# (set MATCHMYJD_NO_CACHE=1 to bypass at runtime)
+DEDUPE_ENABLED = True
+DEDUPE_INDEX_PATH = ".cache/artifacts.sqlite"
+DEDUPE_TTL_SECONDS = 30 * 24 * 3600   # None → never expire
+
+# MinHash / LSH near-duplicate JD index (reposts with a new location,
+# salary line or reordered bullets). bands × rows = num_perm; with
+# 32 × 4 the LSH candidate curve is steep around Jaccard ≈ 0.4–0.6.
+JD_NEAR_DUP = {
+    "enabled": True,
+    "path": ".cache/jd_near_dup.sqlite",
+    "ttl_seconds": 30 * 24 * 3600,   # None → never expire
+    "max_entries": 50_000,           # newest kept per analysis version (None → unbounded)
+    "num_perm": 128,
+    "bands": 32,
+    "shingle_size": 3,
+    "threshold": 0.8,
+    "reextract_diff": True    # False → reuse the neighbour's analysis as-is
+}
+
 # ============================================================
 # 🔧 DEBUG LOGGING
 # ============================================================
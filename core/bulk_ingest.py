@@ -0,0 +1,193 @@
+"""
+core/bulk_ingest.py
+-------------------
+Bulk resume ingestion: directory / manifest → JSONL
+
+- PDFs are parsed across a process pool (PyMuPDF + cleaning is CPU-bound)
+- At most `max_pending` files are in flight, so memory stays flat
+  no matter how large the batch is
+- Each result is written as soon as it completes, one JSON per line:
+  {"path", "sha256", "raw_text", "sections"}  or  {"path", "error"}
+- With analyze=True (--analyze) each parsed resume is also run through
+  the LLM resume analyzer in this process, at BATCH priority so
+  interactive matches sharing the LLM scheduler are served first;
+  records then carry "analysis" as well
+
+CLI:
+    python -m core.bulk_ingest resumes/ --out parsed.jsonl --workers 8
+    python -m core.bulk_ingest manifest.txt --out parsed.jsonl
+    python -m core.bulk_ingest resumes/ --out analyzed.jsonl --analyze
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, Optional
+
+from config.settings import BULK_INGEST_WORKERS
+from core.llm_scheduler import BATCH, llm_priority
+from core.resume_parser import ResumeParser
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESUME_EXTENSIONS = (".pdf",)
+
+
+# ---------------------------------------------------------
+# Input discovery
+# ---------------------------------------------------------
+
+def iter_resume_paths(source: str) -> Iterator[str]:
+    """
+    Directory → every PDF below it (sorted, recursive).
+    File      → manifest with one path per line ('#' comments allowed),
+                relative paths resolved against the manifest's folder.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    yield os.path.join(root, name)
+        return
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line if os.path.isabs(line) else os.path.join(base, line)
+
+
+# ---------------------------------------------------------
+# Worker (runs in a child process)
+# ---------------------------------------------------------
+
+_PARSER: Optional[ResumeParser] = None
+
+
+def _init_worker(quiet: bool) -> None:
+    global _PARSER
+    if quiet:
+        import config.settings
+        config.settings.DEBUG = False
+    _PARSER = ResumeParser()
+
+
+def _parse_one(path: str) -> Dict:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        parsed = _PARSER.parse_bytes(data, source=path)
+        return {
+            "path": path,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "raw_text": parsed["raw_text"],
+            "sections": parsed["sections"]
+        }
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+
+# ---------------------------------------------------------
+# Streaming driver
+# ---------------------------------------------------------
+
+def iter_parsed_resumes(
+    source: str,
+    workers: Optional[int] = BULK_INGEST_WORKERS,
+    max_pending: Optional[int] = None,
+    quiet: bool = True
+) -> Iterator[Dict]:
+    """
+    Yields parsed records in completion order while keeping at most
+    `max_pending` (default 4 × workers) files in flight.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    paths = iter_resume_paths(source)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(quiet,)) as pool:
+        pending = set()
+
+        def _fill():
+            for path in paths:
+                pending.add(pool.submit(_parse_one, path))
+                if len(pending) >= max_pending:
+                    break
+
+        _fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                yield future.result()
+            _fill()
+
+
+def _analyze(record: Dict) -> Dict:
+    """Adds the LLM analysis to a parsed record (runs in the parent process)."""
+    from core.resume_analyzer import analyze_resume
+
+    if "error" in record:
+        return record
+    try:
+        return {**record, "analysis": analyze_resume(record["raw_text"])}
+    except Exception as e:
+        return {"path": record["path"], "error": f"{type(e).__name__}: {e}"}
+
+
+def ingest_resumes(
+    source: str,
+    out_path: str,
+    workers: Optional[int] = BULK_INGEST_WORKERS,
+    max_pending: Optional[int] = None,
+    analyze: bool = False
+) -> Dict[str, float]:
+    """
+    Parses every resume under `source` and streams JSONL to `out_path`.
+    analyze=True also analyzes each resume at BATCH LLM priority.
+    """
+    start = time.perf_counter()
+    stats = {"parsed": 0, "failed": 0}
+
+    with open(out_path, "w", encoding="utf-8") as out, llm_priority(BATCH):
+        for record in iter_parsed_resumes(source, workers, max_pending):
+            if analyze:
+                record = _analyze(record)
+            stats["failed" if "error" in record else "parsed"] += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            total = stats["parsed"] + stats["failed"]
+            if total % 1000 == 0:
+                logger.info(f"Ingested {total} resumes...")
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 2)
+    stats["per_second"] = round((stats["parsed"] + stats["failed"]) / elapsed, 1) if elapsed else 0.0
+    logger.info(f"Bulk ingest complete: {stats}")
+    return stats
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse many resume PDFs into JSONL")
+    parser.add_argument("source", help="Directory of PDFs or a manifest file")
+    parser.add_argument("--out", required=True, help="Output JSONL path")
+    parser.add_argument("--workers", type=int, default=BULK_INGEST_WORKERS)
+    parser.add_argument("--max-pending", type=int, default=None)
+    parser.add_argument("--analyze", action="store_true", help="Also run the LLM resume analyzer")
+    args = parser.parse_args()
+
+    print(json.dumps(
+        ingest_resumes(args.source, args.out, args.workers, args.max_pending, analyze=args.analyze),
+        indent=2
+    ))
@@ -0,0 +1,286 @@
+"""
+core/dedupe.py
+--------------
+Content-hash dedupe layer for resume and JD ingestion.
+
+Two hash levels per document:
+1) raw hash   – SHA-256 of the file bytes / raw JD text
+                (same PDF re-uploaded, same JD pasted again)
+2) text hash  – SHA-256 of the normalized text after
+                ResumeParser._clean_text / preprocess_jd
+                (different bytes, same content)
+
+JDs that miss both hashes can still be served from the MinHash
+near-duplicate index (core/jd_near_dup.py) before the LLM runs.
+
+A local SQLite index maps hash → artifact (parsed text + LLM analysis).
+Duplicates are short-circuited before parsing (raw hit) or before the
+LLM call (text hit). Dedupe rates are tracked per document kind.
+
+Keys also carry the analyzer's analysis_version() (backend/model,
+prompt template, generation config, schema), so changing any of them
+re-analyzes instead of serving stale results. JD keys add the company
+and the boilerplate model version, which decide what gets stripped. Entries expire after
+DEDUPE_TTL_SECONDS; MATCHMYJD_NO_CACHE=1 bypasses the layer.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config.settings import DEDUPE_ENABLED, DEDUPE_INDEX_PATH, DEDUPE_TTL_SECONDS, debug_log
+from core import jd_analyzer, resume_analyzer
+from core.jd_analyzer import analyze_cleaned_jd
+from core.jd_preprocessor import preprocess_jd
+from core.resume_analyzer import analyze_resume_with_status
+from core.resume_parser import ResumeParser
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ---------------------------------------------------------
+# Hashing
+# ---------------------------------------------------------
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hash_bytes(text.encode("utf-8"))
+
+
+# ---------------------------------------------------------
+# Artifact index
+# ---------------------------------------------------------
+
+class ArtifactIndex:
+    """(kind, hash) → JSON artifact, backed by SQLite."""
+
+    def __init__(self, path: str = DEDUPE_INDEX_PATH, ttl_seconds: Optional[float] = DEDUPE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                kind TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, kind: str, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM artifacts WHERE kind = ? AND hash = ?",
+                (kind, digest)
+            ).fetchone()
+        if row is None or self._is_expired(row[1], time.time()):
+            return None
+        return json.loads(row[0])
+
+    def put(self, kind: str, digest: str, payload: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (kind, hash, payload, created_at) VALUES (?, ?, ?, ?)",
+                (kind, digest, json.dumps(payload, ensure_ascii=False), now)
+            )
+            if self.ttl_seconds is not None:
+                self._conn.execute("DELETE FROM artifacts WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.commit()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and (now - created_at) > self.ttl_seconds
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------
+# Dedupe-aware ingestion
+# ---------------------------------------------------------
+
+class DedupeIngestor:
+
+    def __init__(
+        self,
+        index: Optional[ArtifactIndex] = None,
+        use_cache: bool = True,
+        near_dup_index=None
+    ):
+        self.index = index or ArtifactIndex()
+        self.use_cache = use_cache
+        self.near_dup_index = near_dup_index
+        self.parser = ResumeParser()
+        self.versions = {
+            "resume": resume_analyzer.analysis_version(),
+            "jd": jd_analyzer.analysis_version()
+        }
+        self._lock = threading.Lock()
+        self._stats = {
+            kind: {"seen": 0, "raw_hits": 0, "text_hits": 0}
+            for kind in ("resume", "jd")
+        }
+
+    def _key(self, kind: str, digest: str) -> str:
+        # Same content under another model / prompt / schema is a different artifact
+        return f"{digest}:{self.versions[kind]}"
+
+    def _jd_key(self, digest: str, company: Optional[str]) -> str:
+        # Boilerplate stripping depends on the company and the learned model
+        from core.jd_boilerplate import company_key, get_boilerplate_model
+
+        model = get_boilerplate_model()
+        boilerplate = model.version() if model is not None else "none"
+        return f"{self._key('jd', digest)}:{company_key(company) or ''}:{boilerplate}"
+
+    def _count(self, kind: str, field: str) -> None:
+        with self._lock:
+            self._stats[kind][field] += 1
+
+    # ---------------------------------------------------------
+    # Resumes
+    # ---------------------------------------------------------
+
+    def ingest_resume(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Returns {"hash", "parsed": {"raw_text", "sections"}, "analysis", "duplicate_of"}
+        where duplicate_of is "raw", "text" or None.
+        """
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        return self.ingest_resume_bytes(data, source=pdf_path)
+
+    def ingest_resume_bytes(self, data: bytes, source: str = "<bytes>") -> Dict[str, Any]:
+        self._count("resume", "seen")
+
+        raw_digest = self._key("resume", hash_bytes(data))
+        artifact = self.index.get("resume_raw", raw_digest)
+        if artifact is not None:
+            self._count("resume", "raw_hits")
+            debug_log(f"Duplicate resume (raw bytes): {source}")
+            return {**artifact, "duplicate_of": "raw"}
+
+        parsed = self.parser.parse_bytes(data, source=source)
+        if not parsed["raw_text"].strip():
+            raise ValueError(f"❌ Failed to extract resume text: {source}")
+        text_digest = self._key("resume", hash_text(parsed["raw_text"]))
+
+        artifact = self.index.get("resume_text", text_digest)
+        if artifact is not None:
+            self._count("resume", "text_hits")
+            self.index.put("resume_raw", raw_digest, artifact)
+            debug_log(f"Duplicate resume (normalized text): {source}")
+            return {**artifact, "duplicate_of": "text"}
+
+        analysis, failed_sections = analyze_resume_with_status(parsed["raw_text"], use_cache=self.use_cache)
+        artifact = {"hash": text_digest, "parsed": parsed, "analysis": analysis}
+
+        # Degraded analyses are returned but not stored: the next upload retries
+        if failed_sections:
+            debug_log(f"⚠️ Not storing resume analysis with {failed_sections} failed section(s): {source}")
+            return {**artifact, "duplicate_of": None}
+
+        self.index.put("resume_text", text_digest, artifact)
+        self.index.put("resume_raw", raw_digest, artifact)
+        return {**artifact, "duplicate_of": None}
+
+    # ---------------------------------------------------------
+    # Job descriptions
+    # ---------------------------------------------------------
+
+    def ingest_jd(self, raw_jd_text: str, company: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns {"hash", "cleaned", "analysis", "duplicate_of"}.
+        """
+        self._count("jd", "seen")
+
+        raw_digest = self._jd_key(hash_text(raw_jd_text), company)
+        artifact = self.index.get("jd_raw", raw_digest)
+        if artifact is not None:
+            self._count("jd", "raw_hits")
+            return {**artifact, "duplicate_of": "raw"}
+
+        cleaned = preprocess_jd(raw_jd_text)
+        text_digest = self._jd_key(hash_text(cleaned), company)
+
+        artifact = self.index.get("jd_text", text_digest)
+        if artifact is not None:
+            self._count("jd", "text_hits")
+            self.index.put("jd_raw", raw_digest, artifact)
+            return {**artifact, "duplicate_of": "text"}
+
+        artifact = {
+            "hash": text_digest,
+            "cleaned": cleaned,
+            "analysis": analyze_cleaned_jd(
+                cleaned,
+                use_cache=self.use_cache,
+                near_dup_index=self.near_dup_index,
+                company=company
+            )
+        }
+        self.index.put("jd_text", text_digest, artifact)
+        self.index.put("jd_raw", raw_digest, artifact)
+        return {**artifact, "duplicate_of": None}
+
+    # ---------------------------------------------------------
+    # Reporting
+    # ---------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            report = {}
+            for kind, s in self._stats.items():
+                hits = s["raw_hits"] + s["text_hits"]
+                report[kind] = {
+                    **s,
+                    "dedupe_rate": round(hits / s["seen"], 3) if s["seen"] else 0.0
+                }
+        return report
+
+    def log_stats(self) -> None:
+        for kind, s in self.stats().items():
+            if s["seen"]:
+                logger.info(
+                    f"[DEDUPE] {kind}: seen={s['seen']} raw_hits={s['raw_hits']} "
+                    f"text_hits={s['text_hits']} rate={s['dedupe_rate']:.1%}"
+                )
+
+
+# ---------------------------------------------------------
+# Shared instance used by the pipeline
+# ---------------------------------------------------------
+
+_INGESTOR: Optional[DedupeIngestor] = None
+_INGESTOR_LOCK = threading.Lock()
+
+
+def get_dedupe_ingestor() -> Optional[DedupeIngestor]:
+    global _INGESTOR
+
+    if not DEDUPE_ENABLED or os.environ.get("MATCHMYJD_NO_CACHE") == "1":
+        return None
+
+    with _INGESTOR_LOCK:
+        if _INGESTOR is None:
+            from core.jd_near_dup import get_near_dup_index
+            _INGESTOR = DedupeIngestor(near_dup_index=get_near_dup_index())
+    return _INGESTOR
@@ -5,39 +5,34 @@ Hybrid JD Analyzer
 
 Pipeline:
 1) Deterministic preprocessing of raw JD text
-2) LLM (Gemini) extraction into STRICT schema-compliant JSON
+2) LLM extraction (Gemini, or a local / replay backend) into STRICT
+   schema-compliant JSON
 
 Purpose:
 Convert a Job Description into structured metadata
 used downstream by matchers and scorers.
 """
 
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
+import copy
+from typing import Optional, Tuple
 
 from config.settings import (
     GEMINI_MODEL_JD,
+    JD_NEAR_DUP,
+    LLM_STREAM_RESPONSES,
     MAX_TOKENS_JD,
+    STRUCTURED_OUTPUT,
     debug_log
 )
 from core.jd_preprocessor import preprocess_jd
-from utils.json_extractor import extract_json_from_text
+from core.llm_backend import get_llm_backend
+from utils.json_extractor import extract_json_with_status
+from utils.json_stream import read_json_stream
+from utils import metrics
+from utils.llm_cache import get_llm_cache, make_cache_key
+from utils.schema import coerce_to_schema, get_validator, load_schema, response_schema
 
-
-# ---------------------------------------------------------
-# GEMINI CLIENT CONFIG
-# ---------------------------------------------------------
-
-def configure_gemini():
-    load_dotenv()
-    api_key = os.environ.get("GEMINI_API_KEY")
-
-    if not api_key:
-        raise RuntimeError("❌ Missing GEMINI_API_KEY in environment")
-
-    genai.configure(api_key=api_key)
-    debug_log("Gemini client configured successfully.")
+JD_SCHEMA = "jd_schema.json"
 
 
 # ---------------------------------------------------------
@@ -82,48 +77,211 @@ CLEANED JOB DESCRIPTION:
 # MAIN ANALYSIS FUNCTION
 # ---------------------------------------------------------
 
-def analyze_jd(raw_jd_text: str) -> dict:
+def analyze_jd(
+    raw_jd_text: str,
+    use_cache: bool = True,
+    near_dup_index=None,
+    reextract_diff: bool = JD_NEAR_DUP["reextract_diff"],
+    company: Optional[str] = None,
+    stream: bool = LLM_STREAM_RESPONSES
+) -> dict:
     """
     Full JD analysis pipeline:
     1) Preprocess raw JD
-    2) Configure Gemini
-    3) Send prompt to Gemini
-    4) Extract and return validated JSON
-    Retries once if LLM output is truncated.
+    2) Analyze the cleaned text (see analyze_cleaned_jd)
     """
     debug_log("Starting JD analysis...")
 
     cleaned_jd = preprocess_jd(raw_jd_text)
     debug_log(f"Preprocessed JD (truncated): {cleaned_jd[:300]}")
 
-    configure_gemini()
+    return analyze_cleaned_jd(
+        cleaned_jd,
+        use_cache=use_cache,
+        near_dup_index=near_dup_index,
+        reextract_diff=reextract_diff,
+        company=company,
+        stream=stream
+    )
+
+
+def analyze_cleaned_jd(
+    cleaned_jd: str,
+    use_cache: bool = True,
+    near_dup_index=None,
+    reextract_diff: bool = JD_NEAR_DUP["reextract_diff"],
+    company: Optional[str] = None,
+    stream: bool = LLM_STREAM_RESPONSES
+) -> dict:
+    """
+    Structured analysis of an already-preprocessed JD.
+
+    Company / corpus boilerplate (core/jd_boilerplate.py) is stripped
+    first, when a trained model exists.
+
+    With a near_dup_index (core/jd_near_dup.py), a JD within the similarity
+    threshold of one already analyzed reuses that result, re-extracting
+    only the new lines and merging them in (reextract_diff). If a removed
+    line carried an extracted item, the JD is extracted in full. New JDs
+    are added to the index after extraction.
+    """
+    cleaned_jd = _strip_boilerplate(cleaned_jd, company)
+
+    if near_dup_index is None:
+        return _extract_jd(cleaned_jd, use_cache, stream)
+
+    from core.jd_near_dup import diff_lines, merge_jd_structs, removed_lines, removed_lines_carry_items
+
+    match = near_dup_index.query(cleaned_jd)
+    if match is None:
+        result = _extract_jd(cleaned_jd, use_cache, stream)
+        near_dup_index.add(cleaned_jd, result)
+        return result
+
+    entry, similarity = match
+
+    if removed_lines_carry_items(removed_lines(cleaned_jd, entry), entry["struct"]):
+        debug_log(f"Near-duplicate JD (similarity {similarity:.2f}) dropped extracted lines → full extraction")
+        result = _extract_jd(cleaned_jd, use_cache, stream)
+        near_dup_index.add(cleaned_jd, result)
+        return result
+
+    debug_log(f"♻️ Near-duplicate JD (similarity {similarity:.2f}) → reusing analysis")
+
+    changed = diff_lines(cleaned_jd, entry) if reextract_diff else []
+    if not changed:
+        return copy.deepcopy(entry["struct"])
+
+    debug_log(f"Re-extracting {len(changed)} differing line(s)")
+    return merge_jd_structs(entry["struct"], _extract_jd("\n".join(changed), use_cache, stream))
+
 
+def _strip_boilerplate(cleaned_jd: str, company: Optional[str]) -> str:
+    from core.jd_boilerplate import get_boilerplate_model
+
+    model = get_boilerplate_model()
+    if model is None:
+        return cleaned_jd
+
+    stripped, report = model.strip(cleaned_jd, company)
+    if report["lines_removed"]:
+        debug_log(
+            f"✂️ Boilerplate: removed {report['lines_removed']} line(s), "
+            f"saved ~{report['tokens_saved']} prompt tokens "
+            f"({report['tokens_before']} → {report['tokens_after']})"
+        )
+    return stripped
+
+
+def _generation_config() -> dict:
+    config = {
+        "max_output_tokens": MAX_TOKENS_JD,
+        "temperature": 0.2
+    }
+    if STRUCTURED_OUTPUT:
+        config["response_mime_type"] = "application/json"
+        config["response_schema"] = response_schema(JD_SCHEMA)
+    return config
+
+
+def analysis_version() -> str:
+    """
+    Fingerprint of everything that shapes a JD analysis besides the text:
+    backend/model, prompt template, generation config and schema.
+    Stored analyses (core/dedupe.py) are keyed by it.
+    """
+    backend = get_llm_backend()
+    return make_cache_key(
+        backend.cache_namespace(GEMINI_MODEL_JD),
+        build_jd_prompt(""),
+        {**_generation_config(), "schema": load_schema(JD_SCHEMA)}
+    )[:16]
+
+
+def _parse_and_validate(raw_text: str) -> Tuple[dict, bool]:
+    """
+    (parsed JD JSON, repaired) checked against schemas/jd_schema.json.
+    Output that fails validation is coerced field by field (a bare string
+    becomes a list, an unknown seniority is dropped) rather than rejected.
+    repaired=True: the reply was truncated and cut back (never cached).
+    ValueError only if no JSON object could be parsed.
+    """
+    parsed_json, repaired = extract_json_with_status(raw_text)
+    errors = get_validator(JD_SCHEMA)(parsed_json)
+    if errors:
+        metrics.increment("jd.validation_failed")
+        debug_log(f"⚠️ JD failed schema validation, coercing: {errors[:3]}")
+        parsed_json = coerce_to_schema(JD_SCHEMA, parsed_json)
+        metrics.increment("jd.coerced")
+    return parsed_json, repaired
+
+
+def _extract_jd(cleaned_jd: str, use_cache: bool = True, stream: bool = LLM_STREAM_RESPONSES) -> dict:
+    """
+    LLM extraction:
+    1) Return cached result if this exact prompt was analyzed before
+    2) Send prompt to the LLM backend (core/llm_backend.py) with structured output (JSON mime type +
+       response schema); streamed calls stop at the closing brace and
+       repair truncated output structurally instead of re-calling
+    3) Extract JSON and validate it against the JD schema (coercing
+       invalid fields, see _parse_and_validate)
+    Retries once if the output cannot be parsed
+    (counted as metrics "jd.retries").
+    """
     prompt = build_jd_prompt(cleaned_jd)
-    model = genai.GenerativeModel(GEMINI_MODEL_JD)
+    generation_config = _generation_config()
+
+    backend = get_llm_backend()
+    cache_model = backend.cache_namespace(GEMINI_MODEL_JD)
+
+    cache = get_llm_cache() if use_cache else None
+    cache_key = make_cache_key(cache_model, prompt, generation_config)
+
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            try:
+                parsed_json, repaired = _parse_and_validate(cached)
+                if not repaired:
+                    debug_log("JD analysis served from cache.")
+                    return parsed_json
+            except Exception:
+                pass
+            cache.invalidate(cache_key)
 
     for attempt in range(2):  # retry once
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "max_output_tokens": MAX_TOKENS_JD,
-                "temperature": 0.2
-            }
-        )
+        metrics.increment("jd.calls")
+        if attempt:
+            metrics.increment("jd.retries")
 
+        complete = True
         try:
-            raw_text = response.text
-        except AttributeError:
-            raw_text = response.candidates[0].content.parts[0].text
+            if stream:
+                raw_text, complete = read_json_stream(
+                    backend.generate_stream(GEMINI_MODEL_JD, prompt, generation_config)
+                )
+            else:
+                raw_text = backend.generate(GEMINI_MODEL_JD, prompt, generation_config)
+        except ValueError:
+            debug_log(f"⚠️ No JSON in response (attempt {attempt + 1}), retrying...")
+            continue
+        except TimeoutError:
+            debug_log(f"⚠️ LLM call timed out (attempt {attempt + 1}), retrying...")
+            continue
 
         debug_log(f"Raw Gemini response (truncated): {raw_text[:200]}")
 
         try:
-            parsed_json = extract_json_from_text(raw_text)
+            parsed_json, repaired = _parse_and_validate(raw_text)
+            # Repaired truncations are used but never cached
+            if cache is not None and complete and not repaired:
+                cache.set(cache_key, cache_model, raw_text)
             debug_log("JD analysis completed successfully.")
             return parsed_json
-        except Exception:
-            debug_log(f"⚠️ JSON parse failed (attempt {attempt + 1}), retrying...")
+        except Exception as e:
+            debug_log(f"⚠️ JSON parse/validation failed (attempt {attempt + 1}): {e}")
 
+    metrics.increment("jd.failed")
     raise RuntimeError("❌ Failed to extract valid JSON from JD after retries")
 
 
@@ -0,0 +1,287 @@
+"""
+core/jd_boilerplate.py
+----------------------
+Corpus-aware JD boilerplate model.
+
+Companies repeat the same "About us", benefits and EEO paragraphs in
+every posting. We learn line document-frequencies over an ingested JD
+corpus — overall and per company — and strip lines that appear in more
+than a threshold fraction of JDs before the prompt is built.
+
+- Lines are compared by a normalized key (lowercase, digits collapsed,
+  punctuation dropped) so "401(k)" vs "401k" or changing years match
+- Only lines of at least `min_line_chars` are candidates: short skill
+  lines ("Experience with SQL") are common across a corpus but are
+  exactly what the LLM needs to see
+- Lines that mention a known skill (normalizer index) are never
+  stripped, however common: in a domain-focused corpus many JDs share
+  the same requirement lines
+- Statistics only apply once enough JDs were seen (min_*_docs)
+
+The model is persisted as JSON. Every strip() reports prompt tokens saved.
+
+CLI:
+    python -m core.jd_boilerplate learn jds/            (sub-folder = company)
+    python -m core.jd_boilerplate report jd.txt --company acme
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import BOILERPLATE, debug_log
+from core.normalizer import mentions_known_skill
+from utils.helpers import estimate_tokens
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DIGITS = re.compile(r"\d+")
+_NON_ALNUM = re.compile(r"[^a-z0-9# ]+")
+_MULTI_SPACE = re.compile(r"\s+")
+
+
+def line_key(line: str) -> str:
+    key = _DIGITS.sub("0", line.lower())
+    key = _NON_ALNUM.sub(" ", key)
+    return _MULTI_SPACE.sub(" ", key).strip()
+
+
+def company_key(company: Optional[str]) -> Optional[str]:
+    return company.strip().lower() if company and company.strip() else None
+
+
+class BoilerplateModel:
+
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = {**BOILERPLATE, **(settings or {})}
+        self.corpus_docs = 0
+        self.corpus_counts: Counter = Counter()
+        self.company_docs: Counter = Counter()
+        self.company_counts: Dict[str, Counter] = {}
+
+        self.tokens_seen = 0
+        self.tokens_saved = 0
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # Learning
+    # ---------------------------------------------------------
+
+    def _candidate_keys(self, cleaned_jd: str) -> set:
+        min_chars = self.settings["min_line_chars"]
+        return {
+            line_key(line)
+            for line in cleaned_jd.split("\n")
+            if len(line.strip()) >= min_chars
+        }
+
+    def learn(self, cleaned_jd: str, company: Optional[str] = None) -> None:
+        """Adds one preprocessed JD to the line statistics."""
+        keys = self._candidate_keys(cleaned_jd)
+        company = company_key(company)
+
+        with self._lock:
+            self.corpus_docs += 1
+            self.corpus_counts.update(keys)
+            if company:
+                self.company_docs[company] += 1
+                self.company_counts.setdefault(company, Counter()).update(keys)
+            self._version = None
+
+    def learn_many(self, jds: Iterable[Tuple[str, Optional[str]]]) -> None:
+        for cleaned_jd, company in jds:
+            self.learn(cleaned_jd, company)
+
+    # ---------------------------------------------------------
+    # Stripping
+    # ---------------------------------------------------------
+
+    def is_boilerplate(self, line: str, company: Optional[str] = None) -> bool:
+        s = self.settings
+        if len(line.strip()) < s["min_line_chars"]:
+            return False
+        if mentions_known_skill(line):
+            return False
+
+        key = line_key(line)
+        company = company_key(company)
+
+        if company and self.company_docs[company] >= s["min_company_docs"]:
+            frac = self.company_counts[company][key] / self.company_docs[company]
+            if frac >= s["company_threshold"]:
+                return True
+
+        if self.corpus_docs >= s["min_corpus_docs"]:
+            if self.corpus_counts[key] / self.corpus_docs >= s["corpus_threshold"]:
+                return True
+
+        return False
+
+    def strip(self, cleaned_jd: str, company: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+        """
+        Returns (stripped_jd, report) with
+        report = {lines_removed, tokens_before, tokens_after, tokens_saved}.
+        """
+        kept: List[str] = []
+        removed = 0
+        for line in cleaned_jd.split("\n"):
+            if self.is_boilerplate(line, company):
+                removed += 1
+                debug_log(f"Removed boilerplate line: {line[:80]}")
+            else:
+                kept.append(line)
+
+        stripped = "\n".join(kept)
+        before = estimate_tokens(cleaned_jd)
+        after = estimate_tokens(stripped)
+
+        with self._lock:
+            self.tokens_seen += before
+            self.tokens_saved += before - after
+
+        return stripped, {
+            "lines_removed": removed,
+            "tokens_before": before,
+            "tokens_after": after,
+            "tokens_saved": before - after
+        }
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "corpus_docs": self.corpus_docs,
+                "companies": len(self.company_docs),
+                "tokens_seen": self.tokens_seen,
+                "tokens_saved": self.tokens_saved,
+                "saved_fraction": round(self.tokens_saved / self.tokens_seen, 3) if self.tokens_seen else 0.0
+            }
+
+    def version(self) -> str:
+        """
+        Fingerprint of the settings and line statistics: stored JD
+        analyses (core/dedupe.py) are keyed by it, since what gets
+        stripped changes with them. Recomputed only after learn().
+        """
+        with self._lock:
+            if self._version is None:
+                payload = json.dumps(
+                    {"settings": self.settings, **self._payload()},
+                    sort_keys=True,
+                    ensure_ascii=False,
+                    default=str
+                )
+                self._version = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+            return self._version
+
+    # ---------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------
+
+    def _payload(self) -> Dict:
+        return {
+            "corpus_docs": self.corpus_docs,
+            "corpus_counts": dict(self.corpus_counts),
+            "company_docs": dict(self.company_docs),
+            "company_counts": {c: dict(counts) for c, counts in self.company_counts.items()}
+        }
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            payload = self._payload()
+
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, settings: Optional[Dict] = None) -> "BoilerplateModel":
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+
+        model = cls(settings)
+        model.corpus_docs = payload["corpus_docs"]
+        model.corpus_counts = Counter(payload["corpus_counts"])
+        model.company_docs = Counter(payload["company_docs"])
+        model.company_counts = {c: Counter(counts) for c, counts in payload["company_counts"].items()}
+        return model
+
+
+# ---------------------------------------------------------
+# Shared instance used by the JD analyzer
+# ---------------------------------------------------------
+
+_MODEL: Optional[BoilerplateModel] = None
+_MODEL_LOCK = threading.Lock()
+
+
+def get_boilerplate_model() -> Optional[BoilerplateModel]:
+    """Persisted model, or None when disabled / not trained yet."""
+    global _MODEL
+
+    if not BOILERPLATE["enabled"] or not os.path.exists(BOILERPLATE["path"]):
+        return None
+
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            _MODEL = BoilerplateModel.load(BOILERPLATE["path"])
+            logger.info(f"Boilerplate model loaded ({_MODEL.corpus_docs} JDs)")
+    return _MODEL
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def _iter_corpus(root: str):
+    """*.txt JDs under root; the first sub-folder names the company."""
+    for dirpath, dirs, files in os.walk(root):
+        dirs.sort()
+        rel = os.path.relpath(dirpath, root)
+        company = None if rel == "." else rel.split(os.sep)[0]
+        for name in sorted(files):
+            if name.lower().endswith(".txt"):
+                with open(os.path.join(dirpath, name), "r", encoding="utf-8") as f:
+                    yield f.read(), company
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.jd_preprocessor import preprocess_jd
+
+    parser = argparse.ArgumentParser(description="Learn / apply the JD boilerplate model")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    learn = sub.add_parser("learn")
+    learn.add_argument("corpus", help="Folder of .txt JDs (sub-folder = company)")
+    learn.add_argument("--path", default=BOILERPLATE["path"])
+    learn.add_argument("--append", action="store_true", help="Add to the existing model")
+
+    report = sub.add_parser("report")
+    report.add_argument("jd", help="JD text file")
+    report.add_argument("--company", default=None)
+    report.add_argument("--path", default=BOILERPLATE["path"])
+
+    args = parser.parse_args()
+
+    if args.command == "learn":
+        model = BoilerplateModel.load(args.path) if args.append and os.path.exists(args.path) else BoilerplateModel()
+        model.learn_many((preprocess_jd(text), company) for text, company in _iter_corpus(args.corpus))
+        model.save(args.path)
+        print(json.dumps(model.stats(), indent=2))
+    else:
+        model = BoilerplateModel.load(args.path)
+        with open(args.jd, "r", encoding="utf-8") as f:
+            _, result = model.strip(preprocess_jd(f.read()), args.company)
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,373 @@
+"""
+core/jd_near_dup.py
+-------------------
+Near-duplicate JD detection (MinHash + LSH banding).
+
+Exact hashing (core/dedupe.py) misses reposts that differ only in the
+location, a salary line or bullet order. Here every preprocessed JD is
+reduced to a MinHash signature over word shingles taken *within* lines,
+so reordering bullets does not change the shingle set.
+
+- Signature:  num_perm mins of (a·h(x) + b) mod (2^61 − 1)
+- LSH:        signature split into `bands` bands of num_perm / bands rows;
+              two JDs become candidates if any band matches exactly
+- Match:      best candidate whose estimated Jaccard ≥ threshold
+
+Each indexed entry keeps its cleaned lines and structured analysis, so
+analyze_jd can reuse it, re-extracting only the new lines. JDs with no
+text (no shingles) are never indexed or matched. The shared index is
+persisted in SQLite, one row per entry, stamped with the JD analysis
+version + backend and subject to a TTL / size cap; MATCHMYJD_NO_CACHE=1
+disables it.
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import JD_NEAR_DUP, debug_log
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+# ---------------------------------------------------------
+# Shingling + MinHash
+# ---------------------------------------------------------
+
+def jd_lines(cleaned_jd: str) -> List[str]:
+    return [line.strip() for line in cleaned_jd.split("\n") if line.strip()]
+
+
+def shingles(cleaned_jd: str, size: int = JD_NEAR_DUP["shingle_size"]) -> set:
+    """Word n-grams within each line (short lines become one shingle)."""
+    out = set()
+    for line in jd_lines(cleaned_jd):
+        words = line.lower().split()
+        if len(words) <= size:
+            out.add(" ".join(words))
+            continue
+        for i in range(len(words) - size + 1):
+            out.add(" ".join(words[i:i + size]))
+    return out
+
+
+class MinHasher:
+
+    def __init__(self, num_perm: int = JD_NEAR_DUP["num_perm"], seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # a < 2^31 and h(x) < 2^32 keep a·h(x) + b inside uint64
+        self.a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, shingle_set: set) -> np.ndarray:
+        if not shingle_set:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+            dtype=np.uint64,
+            count=len(shingle_set)
+        )
+        # (n_shingles, num_perm) → min over shingles
+        permuted = (hashes[:, None] * self.a[None, :] + self.b[None, :]) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.mean(sig_a == sig_b))
+
+
+# ---------------------------------------------------------
+# LSH index
+# ---------------------------------------------------------
+
+class NearDupIndex:
+    """
+    In-memory LSH index, optionally backed by SQLite (`path`).
+
+    Entries are stamped with `version` (analysis version + backend); only
+    entries of the current version are loaded or matched, so a model /
+    prompt / schema / backend change never reuses an old analysis.
+    Entries older than ttl_seconds are ignored, and only the newest
+    max_entries are kept. Each add is one INSERT, so concurrent
+    processes never overwrite each other's entries.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = JD_NEAR_DUP["num_perm"],
+        bands: int = JD_NEAR_DUP["bands"],
+        threshold: float = JD_NEAR_DUP["threshold"],
+        shingle_size: int = JD_NEAR_DUP["shingle_size"],
+        path: Optional[str] = None,
+        version: str = "",
+        ttl_seconds: Optional[float] = JD_NEAR_DUP["ttl_seconds"],
+        max_entries: Optional[int] = JD_NEAR_DUP["max_entries"]
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Signatures are only comparable under the same MinHash parameters
+        self.version = f"{version}:{num_perm}x{shingle_size}"
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # Evicted entries become None (bucket ids stay valid)
+        self._entries: List[Optional[Dict[str, Any]]] = []
+        self._signatures: List[np.ndarray] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._live = 0
+        self._oldest = 0
+        self._lock = threading.Lock()
+
+        self._conn = None
+        if path:
+            self._open(path)
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _signature(self, cleaned_jd: str) -> Optional[np.ndarray]:
+        # Empty / whitespace JDs would all share the same signature
+        shingle_set = shingles(cleaned_jd, self.shingle_size)
+        return self.hasher.signature(shingle_set) if shingle_set else None
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, sig: np.ndarray, entry: Dict[str, Any]) -> int:
+        eid = len(self._entries)
+        self._entries.append(entry)
+        self._signatures.append(sig)
+        for band, key in zip(self._buckets, self._band_keys(sig)):
+            band.setdefault(key, []).append(eid)
+        self._live += 1
+
+        # Entries are appended oldest first
+        while self.max_entries is not None and self._live > self.max_entries:
+            if self._entries[self._oldest] is not None:
+                self._entries[self._oldest] = None
+                self._live -= 1
+            self._oldest += 1
+        return eid
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and (now - created_at) > self.ttl_seconds
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+
+    def add(self, cleaned_jd: str, jd_struct: Dict[str, Any]) -> Optional[int]:
+        """Indexes a copy of jd_struct; returns the entry id (None for an empty JD)."""
+        sig = self._signature(cleaned_jd)
+        if sig is None:
+            return None
+        entry = {
+            "lines": jd_lines(cleaned_jd),
+            "struct": copy.deepcopy(jd_struct),
+            "created_at": time.time()
+        }
+        with self._lock:
+            if self._conn is not None:
+                self._persist(sig, entry)
+            return self._insert(sig, entry)
+
+    def query(self, cleaned_jd: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Best indexed entry with estimated Jaccard ≥ threshold, or None.
+        The entry is shared with the index: copy before mutating.
+        """
+        sig = self._signature(cleaned_jd)
+        if sig is None:
+            return None
+
+        now = time.time()
+        with self._lock:
+            candidates = set()
+            for band, key in zip(self._buckets, self._band_keys(sig)):
+                candidates.update(band.get(key, ()))
+
+            best, best_sim = None, 0.0
+            for eid in candidates:
+                entry = self._entries[eid]
+                if entry is None or self._is_expired(entry["created_at"], now):
+                    continue
+                sim = estimate_jaccard(sig, self._signatures[eid])
+                if sim > best_sim:
+                    best, best_sim = entry, sim
+
+        debug_log(f"Near-dup lookup: {len(candidates)} candidates, best={best_sim:.2f}")
+        if best is None or best_sim < self.threshold:
+            return None
+        return best, best_sim
+
+    # ---------------------------------------------------------
+    # Persistence (SQLite, same approach as core/dedupe.ArtifactIndex)
+    # ---------------------------------------------------------
+
+    def _open(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS near_dup (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                version TEXT NOT NULL,
+                lines TEXT NOT NULL,
+                struct TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_near_dup_version ON near_dup(version, id)")
+        self._conn.commit()
+
+        now = time.time()
+        min_created = now - self.ttl_seconds if self.ttl_seconds is not None else 0.0
+        rows = self._conn.execute(
+            """
+            SELECT lines, struct, signature, created_at FROM near_dup
+            WHERE version = ? AND created_at >= ?
+            ORDER BY id DESC LIMIT ?
+            """,
+            (self.version, min_created, -1 if self.max_entries is None else self.max_entries)
+        ).fetchall()
+
+        for lines, struct, signature, created_at in reversed(rows):
+            entry = {"lines": json.loads(lines), "struct": json.loads(struct), "created_at": created_at}
+            self._insert(np.frombuffer(signature, dtype=np.uint64).copy(), entry)
+
+    def _persist(self, sig: np.ndarray, entry: Dict[str, Any]) -> None:
+        now = entry["created_at"]
+        self._conn.execute(
+            "INSERT INTO near_dup (version, lines, struct, signature, created_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                self.version,
+                json.dumps(entry["lines"], ensure_ascii=False),
+                json.dumps(entry["struct"], ensure_ascii=False),
+                sig.astype(np.uint64).tobytes(),
+                now
+            )
+        )
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM near_dup WHERE created_at < ?", (now - self.ttl_seconds,))
+        if self.max_entries is not None:
+            self._conn.execute(
+                """
+                DELETE FROM near_dup WHERE id IN (
+                    SELECT id FROM near_dup WHERE version = ?
+                    ORDER BY id DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.version, self.max_entries)
+            )
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# ---------------------------------------------------------
+# Reuse helpers
+# ---------------------------------------------------------
+
+def diff_lines(cleaned_jd: str, entry: Dict[str, Any]) -> List[str]:
+    """Lines of the new JD that the indexed JD did not contain."""
+    known = {line.lower() for line in entry["lines"]}
+    return [line for line in jd_lines(cleaned_jd) if line.lower() not in known]
+
+
+def removed_lines(cleaned_jd: str, entry: Dict[str, Any]) -> List[str]:
+    """Lines of the indexed JD that the new JD no longer contains."""
+    current = {line.lower() for line in jd_lines(cleaned_jd)}
+    return [line for line in entry["lines"] if line.lower() not in current]
+
+
+def removed_lines_carry_items(removed: List[str], jd_struct: Dict[str, Any]) -> bool:
+    """
+    True if a removed line mentions any extracted list item (skill,
+    responsibility, ...). The merge can add items but not retract them,
+    so such a JD has to be re-extracted in full.
+    """
+    text = "\n".join(removed).lower()
+    for value in jd_struct.values():
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, str) and item.strip() and item.lower() in text:
+                    return True
+    return False
+
+
+def merge_jd_structs(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Union list fields (order-preserving). Scalars (e.g. seniority) keep the
+    base value — a few changed lines are too little context to re-infer them.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in delta.items():
+        if isinstance(value, list):
+            seen = {str(v).lower() for v in merged.get(key, []) or []}
+            merged[key] = list(merged.get(key, []) or []) + [
+                v for v in value if str(v).lower() not in seen
+            ]
+        elif value and not merged.get(key):
+            merged[key] = value
+    return merged
+
+
+# ---------------------------------------------------------
+# Shared instance used by the pipeline
+# ---------------------------------------------------------
+
+_INDEX: Optional[NearDupIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def index_version() -> str:
+    """Analysis version + backend: entries from another model, prompt or backend never match."""
+    from core import jd_analyzer
+    from core.llm_backend import backend_name
+
+    return f"{backend_name()}:{jd_analyzer.analysis_version()}"
+
+
+def get_near_dup_index() -> Optional[NearDupIndex]:
+    """
+    Returns the process-wide index, or None when disabled
+    (JD_NEAR_DUP["enabled"] = False or MATCHMYJD_NO_CACHE=1).
+    """
+    global _INDEX
+
+    if not JD_NEAR_DUP["enabled"] or os.environ.get("MATCHMYJD_NO_CACHE") == "1":
+        return None
+
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = NearDupIndex(path=JD_NEAR_DUP["path"], version=index_version())
+            logger.info(f"Near-dup JD index ready ({len(_INDEX)} JDs)")
+    return _INDEX
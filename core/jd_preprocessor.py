@@ -7,13 +7,33 @@ This converts raw noisy job descriptions from any website
 into a clean, structured, machine-readable format.
 """
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
 from config.settings import STOPWORDS, debug_log
 
+# All noise patterns compiled once into a single alternation
+NOISE_PATTERNS = [
+    r"^apply now",
+    r"^click here",
+    r"equal opportunity employer",
+    r"drug free workplace",
+    r"terms and conditions",
+    r"privacy policy",
+    r"job id[: ]",
+    r"salary[: ]",
+]
+_NOISE_RE = re.compile("|".join(f"(?:{p})" for p in NOISE_PATTERNS), re.IGNORECASE)
+
 
 class JDPreprocessor:
 
-    def __init__(self):
+    def __init__(self, verbose: bool = True):
+        # verbose=False skips the per-line debug logs (batch mode)
+        self.verbose = verbose
+
         # Regex patterns for cleaning
         self.bullet_pattern = re.compile(r"^[•\-▪–·\*]\s*")
         self.whitespace_pattern = re.compile(r"\s+")
@@ -28,7 +48,9 @@ class JDPreprocessor:
     # Main public method
     # ---------------------------------------------------------
     def preprocess(self, text: str) -> str:
-        debug_log("Starting JD preprocessing...")
+        verbose = self.verbose
+        if verbose:
+            debug_log("Starting JD preprocessing...")
 
         if not text or len(text.strip()) == 0:
             return ""
@@ -58,25 +80,29 @@ class JDPreprocessor:
             if self.section_header_pattern.match(line.lower()):
                 line = line.title()
 
-            # Enforce skill normalization in-place (Python always treated as tool)
             lowered = line.lower()
-            for term in self.force_tool_terms:
-                if f"{term}" in lowered:
-                    debug_log(f"Found special skill '{term}' in JD → normalized")
-                    # does NOT replace the line, just logs the skill
-                    # actual categorization happens in jd_analyzer
-                    break
+
+            # Enforce skill normalization in-place (Python always treated as tool)
+            if verbose:
+                for term in self.force_tool_terms:
+                    if f"{term}" in lowered:
+                        debug_log(f"Found special skill '{term}' in JD → normalized")
+                        # does NOT replace the line, just logs the skill
+                        # actual categorization happens in jd_analyzer
+                        break
 
             # Deduplicate
-            if line.lower() in seen:
+            if lowered in seen:
                 continue
 
-            seen.add(line.lower())
+            seen.add(lowered)
             cleaned_lines.append(line)
-            debug_log(f"Processed line: {original} → {line}")
+            if verbose:
+                debug_log(f"Processed line: {original} → {line}")
 
         cleaned_text = "\n".join(cleaned_lines)
-        debug_log("JD preprocessing complete.")
+        if verbose:
+            debug_log("JD preprocessing complete.")
         return cleaned_text
 
     # ---------------------------------------------------------
@@ -84,31 +110,21 @@ class JDPreprocessor:
     # ---------------------------------------------------------
     def _is_noise(self, line: str) -> bool:
 
-        noise_patterns = [
-            r"^apply now",
-            r"^click here",
-            r"equal opportunity employer",
-            r"drug free workplace",
-            r"terms and conditions",
-            r"privacy policy",
-            r"job id[: ]",
-            r"salary[: ]",
-        ]
-
-        for pattern in noise_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
+        if _NOISE_RE.search(line):
+            if self.verbose:
                 debug_log(f"Removed noise line: {line}")
-                return True
+            return True
 
         # Remove lines that are only stopwords
-        tokens = [t for t in line.lower().split() if t not in STOPWORDS]
-        if len(tokens) == 0:
-            debug_log(f"Removed stopword-only line: {line}")
+        if all(t in STOPWORDS for t in line.lower().split()):
+            if self.verbose:
+                debug_log(f"Removed stopword-only line: {line}")
             return True
 
         # Remove extremely short lines (<3 chars)
         if len(line) < 3:
-            debug_log(f"Removed very short line: {line}")
+            if self.verbose:
+                debug_log(f"Removed very short line: {line}")
             return True
 
         return False
@@ -118,9 +134,38 @@ class JDPreprocessor:
 # Utility wrapper
 # ---------------------------------------------------------
 
+_PROCESSOR = JDPreprocessor()
+
+
 def preprocess_jd(text: str) -> str:
-    processor = JDPreprocessor()
-    return processor.preprocess(text)
+    return _PROCESSOR.preprocess(text)
+
+
+# ---------------------------------------------------------
+# Batch API
+# ---------------------------------------------------------
+
+_BATCH_PROCESSOR = JDPreprocessor(verbose=False)
+
+
+def _preprocess_quiet(text: str) -> str:
+    return _BATCH_PROCESSOR.preprocess(text)
+
+
+def preprocess_many(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 64
+) -> List[str]:
+    """
+    Preprocesses many JDs with one shared (non-verbose) processor.
+    workers > 1 spreads the corpus across processes; results keep input order.
+    """
+    if workers is None or workers <= 1:
+        return [_BATCH_PROCESSOR.preprocess(t) for t in texts]
+
+    with ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1)) as pool:
+        return list(pool.map(_preprocess_quiet, texts, chunksize=chunksize))
 
 
 # ---------------------------------------------------------
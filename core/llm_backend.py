@@ -0,0 +1,409 @@
+"""
+core/llm_backend.py
+-------------------
+LLM backend layer shared by the JD analyzer, the resume analyzer and
+core/llm_extracter.py.
+
+Backends:
+- "gemini" → GeminiBackend: Gemini configured once, one reused
+             GenerativeModel per model name (thread-safe, lazy SDK import)
+- "local"  → LocalBackend: rule-based extractor, no network; answers the
+             JD / resume-section / packed-resume prompts with the same
+             JSON shape, so the full pipeline can run and be load-tested
+             offline at full speed
+- "replay" → ReplayBackend: serves responses recorded in the LLM cache
+             (same content-addressed keys); misses go to a fallback
+             backend or raise
+- "fake"   → LocalBackend behind injected latency (LLM_FAKE_LATENCY),
+             for testing hedging / timeouts (core/llm_hedging.py)
+
+Selection: MATCHMYJD_LLM_BACKEND env var, else settings.LLM_BACKEND.
+Gemini calls go through the shared rate-limit scheduler
+(core/llm_scheduler.py) when LLM_RATE_LIMITS["enabled"], and are
+hedged (core/llm_hedging.py) when LLM_HEDGING["enabled"]; each hedged
+attempt is then scheduled on its own.
+
+Gemini SDK timeouts (DeadlineExceeded) surface as LLMTimeoutError.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from config.settings import (
+    LLM_BACKEND,
+    LLM_CACHE_PATH,
+    LLM_CALL_DEADLINE_SECONDS,
+    LLM_CALL_TIMEOUT_SECONDS,
+    LLM_FAKE_LATENCY,
+    LLM_HEDGING,
+    LLM_RATE_LIMITS,
+    LLM_REPLAY_FALLBACK,
+    debug_log
+)
+from core.llm_scheduler import LLMTimeoutError, attempt_timeout, is_deadline
+from utils import metrics
+from utils.helpers import estimate_tokens
+from utils.json_stream import iter_chunk_text
+from utils.llm_cache import LLMCache, make_cache_key
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMBackend:
+    """generate() → full text; generate_stream() → text chunks."""
+
+    name = "base"
+
+    def generate(self, model_name: str, prompt: str, generation_config: Optional[dict] = None) -> str:
+        raise NotImplementedError
+
+    def generate_stream(self, model_name: str, prompt: str, generation_config: Optional[dict] = None) -> Iterable[str]:
+        yield self.generate(model_name, prompt, generation_config)
+
+    def cache_namespace(self, model_name: str) -> str:
+        """Model name used in LLM cache keys (keeps non-Gemini output apart)."""
+        return model_name
+
+
+# ---------------------------------------------------------
+# Gemini
+# ---------------------------------------------------------
+
+def _response_text(response) -> str:
+    try:
+        return response.text
+    except AttributeError:
+        return response.candidates[0].content.parts[0].text
+
+
+@contextmanager
+def _sdk_timeouts():
+    try:
+        yield
+    except Exception as e:
+        if not is_deadline(e):
+            raise
+        metrics.increment("llm.timeouts")
+        raise LLMTimeoutError(f"Gemini call timed out: {e}") from e
+
+
+def _chunks_with_timeouts(chunks: Iterable[str]) -> Iterator[str]:
+    with _sdk_timeouts():
+        yield from chunks
+
+
+class GeminiBackend(LLMBackend):
+
+    name = "gemini"
+
+    def __init__(self):
+        self._configured = False
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _configure(self) -> None:
+        # Heavy SDK imports are deferred until an LLM call actually happens
+        from dotenv import load_dotenv
+        import google.generativeai as genai
+
+        load_dotenv()
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("❌ Missing GEMINI_API_KEY in environment")
+
+        genai.configure(api_key=api_key)
+        self._configured = True
+        debug_log("Gemini client configured successfully.")
+
+    def model(self, model_name: str):
+        with self._lock:
+            if not self._configured:
+                self._configure()
+            if model_name not in self._models:
+                import google.generativeai as genai
+                self._models[model_name] = genai.GenerativeModel(model_name)
+            return self._models[model_name]
+
+    def generate(self, model_name, prompt, generation_config=None):
+        with _sdk_timeouts():
+            response = self.model(model_name).generate_content(
+                prompt,
+                generation_config=generation_config,
+                request_options={"timeout": attempt_timeout(LLM_CALL_TIMEOUT_SECONDS)}
+            )
+            return _response_text(response)
+
+    def generate_stream(self, model_name, prompt, generation_config=None):
+        # The request is sent here, so the timeout reflects this attempt
+        with _sdk_timeouts():
+            response = self.model(model_name).generate_content(
+                prompt,
+                generation_config=generation_config,
+                stream=True,
+                request_options={"timeout": attempt_timeout(LLM_CALL_TIMEOUT_SECONDS)}
+            )
+        return _chunks_with_timeouts(iter_chunk_text(response))
+
+
+# ---------------------------------------------------------
+# Local (rule-based)
+# ---------------------------------------------------------
+
+LOCAL_TOOLS = [
+    "python", "java", "c++", "c#", "golang", "rust", "scala", "javascript", "typescript",
+    "sql", "r", "bash", "git", "docker", "kubernetes", "aws", "gcp", "azure",
+    "linux", "spark", "hadoop", "kafka", "airflow", "tensorflow", "pytorch",
+    "scikit-learn", "pandas", "numpy", "react", "node.js", "django", "flask",
+    "fastapi", "postgresql", "mysql", "mongodb", "redis", "terraform", "jenkins",
+]
+
+LOCAL_SKILLS = [
+    "machine learning", "deep learning", "nlp", "natural language processing",
+    "computer vision", "data structures", "algorithms", "distributed systems",
+    "statistics", "data analysis", "data science", "big data", "microservices",
+    "rest apis", "system design", "cloud computing", "ci/cd", "etl",
+    "data engineering", "speech recognition", "reinforcement learning",
+    "llm", "generative ai", "mlops", "unit testing", "agile",
+]
+
+_NICE_MARKERS = re.compile(r"\b(preferred|nice to have|bonus|a plus|is a plus|desirable|familiarity)\b", re.IGNORECASE)
+_SENIOR = re.compile(r"\b(senior|staff|principal|lead|architect|\d{2}\+? years|[5-9]\+? years)\b", re.IGNORECASE)
+_ENTRY = re.compile(r"\b(intern|internship|entry[- ]level|junior|new grad|graduate|[0-2]\+? years)\b", re.IGNORECASE)
+_ACTION = re.compile(
+    r"^(build|design|develop|own|lead|drive|work|collaborate|implement|deploy|"
+    r"maintain|create|improve|analy[sz]e|partner|write|research|support|manage|ship)\w*\b",
+    re.IGNORECASE
+)
+_CLAUSES = re.compile(r"\n|(?<=[.;])\s+")
+_SECTION_BLOCK = re.compile(r"^=== SECTION: (.+?) ===$", re.MULTILINE)
+
+
+class LocalBackend(LLMBackend):
+    """Deterministic keyword extraction over a fixed lexicon + normalizer index."""
+
+    name = "local"
+
+    def __init__(self, extra_terms: Optional[Iterable[str]] = None):
+        from core.normalizer import _INDEX
+
+        terms = set(LOCAL_TOOLS) | set(LOCAL_SKILLS) | set(_INDEX) | set(extra_terms or [])
+        terms = sorted((t for t in terms if len(t) > 1 or t == "r"), key=len, reverse=True)
+        alternation = "|".join(re.escape(t) for t in terms)
+        self._pattern = re.compile(rf"(?<![\w+#.])({alternation})(?![\w+#])", re.IGNORECASE)
+        self._tools = set(LOCAL_TOOLS)
+
+    def cache_namespace(self, model_name):
+        return f"local/{model_name}"
+
+    # ---------------------------------------------------------
+    # Rules
+    # ---------------------------------------------------------
+
+    def _find(self, text: str) -> List[str]:
+        from core.normalizer import normalize_skill
+        # Single-letter "r" only counts when written as "R"
+        found = [m for m in self._pattern.findall(text) if m != "r"]
+        return list(dict.fromkeys(normalize_skill(m) for m in found))
+
+    def extract_jd(self, text: str) -> dict:
+        must, nice, responsibilities = [], [], []
+        for line in (l.strip() for l in _CLAUSES.split(text)):
+            if not line:
+                continue
+            skills = self._find(line)
+            (nice if _NICE_MARKERS.search(line) else must).extend(skills)
+            if _ACTION.match(line) and len(responsibilities) < 10:
+                responsibilities.append(line[:120])
+
+        must = list(dict.fromkeys(must))
+        nice = [s for s in dict.fromkeys(nice) if s not in must]
+
+        if _SENIOR.search(text):
+            seniority = "senior"
+        elif _ENTRY.search(text):
+            seniority = "entry"
+        else:
+            seniority = "mid"
+
+        return {
+            "must_have_skills": must,
+            "nice_to_have_skills": nice,
+            "responsibilities": responsibilities,
+            "seniority": seniority
+        }
+
+    def extract_resume_section(self, section_name: str, text: str) -> dict:
+        skills_with_evidence: Dict[str, List[str]] = {}
+        projects: List[str] = []
+
+        for line in (l.strip(" •-*\t") for l in text.splitlines()):
+            if not line:
+                continue
+            for skill in self._find(line):
+                evidence = skills_with_evidence.setdefault(skill, [])
+                if len(evidence) < 3:
+                    evidence.append(f"{section_name}: {line[:80]}")
+            if "project" in section_name.lower() and len(line) <= 80 and len(projects) < 10:
+                projects.append(line)
+
+        tools = [s for s in skills_with_evidence if s in self._tools]
+        return {
+            "skills_with_evidence": skills_with_evidence,
+            "projects": projects,
+            "tools": tools
+        }
+
+    # ---------------------------------------------------------
+    # Prompt dispatch
+    # ---------------------------------------------------------
+
+    def generate(self, model_name, prompt, generation_config=None):
+        if "=== SECTION:" in prompt:
+            parts = _SECTION_BLOCK.split(prompt)
+            # parts = [preamble, name1, body1, name2, body2, ...]
+            result = {
+                name: self.extract_resume_section(name, body)
+                for name, body in zip(parts[1::2], parts[2::2])
+            }
+        elif "SECTION TEXT:" in prompt:
+            header = re.search(r"analyzing ONLY this resume section: (.+)", prompt)
+            name = header.group(1).strip() if header else "section"
+            result = self.extract_resume_section(name, prompt.split("SECTION TEXT:", 1)[1])
+        elif "CLEANED JOB DESCRIPTION:" in prompt:
+            result = self.extract_jd(prompt.split("CLEANED JOB DESCRIPTION:", 1)[1])
+        elif "TEXT:" in prompt:
+            # core/llm_extracter.extract_with_schema
+            text = prompt.split("TEXT:", 1)[1].split("Return ONLY valid JSON", 1)[0]
+            if '"must_have_skills"' in prompt:
+                result = self.extract_jd(text)
+            else:
+                result = self.extract_resume_section("resume", text)
+        else:
+            raise ValueError("LocalBackend: unrecognized prompt format")
+
+        return json.dumps(result, ensure_ascii=False)
+
+
+# ---------------------------------------------------------
+# Replay (recorded responses)
+# ---------------------------------------------------------
+
+class ReplayBackend(LLMBackend):
+    """Responses recorded in the LLM cache, looked up by the same key the analyzers use."""
+
+    name = "replay"
+
+    def __init__(self, path: str = LLM_CACHE_PATH, fallback: Optional[LLMBackend] = None):
+        self.store = LLMCache(path, ttl_seconds=None, max_entries=None)
+        self.fallback = fallback
+
+    def generate(self, model_name, prompt, generation_config=None):
+        recorded = self.store.get(make_cache_key(model_name, prompt, generation_config))
+        if recorded is not None:
+            return recorded
+        if self.fallback is None:
+            raise LookupError(f"ReplayBackend: no recorded response for this {model_name} prompt")
+        debug_log(f"Replay miss → {self.fallback.name} backend")
+        return self.fallback.generate(model_name, prompt, generation_config)
+
+    def cache_namespace(self, model_name):
+        # Replays come from real responses; fallback output must not be cached as such
+        return model_name if self.fallback is None else self.fallback.cache_namespace(model_name)
+
+
+# ---------------------------------------------------------
+# Rate-limited wrapper
+# ---------------------------------------------------------
+
+def estimate_call_tokens(prompt: str, generation_config: Optional[dict]) -> int:
+    """Token-bucket cost of one call: prompt estimate + expected output."""
+    max_output = (generation_config or {}).get("max_output_tokens") or LLM_RATE_LIMITS["output_token_estimate"]
+    return estimate_tokens(prompt) + min(max_output, LLM_RATE_LIMITS["output_token_estimate"])
+
+
+class ScheduledBackend(LLMBackend):
+    """
+    Sends every call of `inner` through the shared LLMScheduler
+    (core/llm_scheduler.py), within LLM_CALL_DEADLINE_SECONDS per call.
+    """
+
+    def __init__(self, inner: LLMBackend, scheduler, deadline_seconds: float = LLM_CALL_DEADLINE_SECONDS):
+        self.inner = inner
+        self.scheduler = scheduler
+        self.deadline_seconds = deadline_seconds
+        self.name = inner.name
+
+    def generate(self, model_name, prompt, generation_config=None):
+        return self.scheduler.call(
+            lambda: self.inner.generate(model_name, prompt, generation_config),
+            estimate_call_tokens(prompt, generation_config),
+            deadline=time.monotonic() + self.deadline_seconds
+        )
+
+    def generate_stream(self, model_name, prompt, generation_config=None):
+        return self.scheduler.stream(
+            lambda: self.inner.generate_stream(model_name, prompt, generation_config),
+            estimate_call_tokens(prompt, generation_config),
+            deadline=time.monotonic() + self.deadline_seconds
+        )
+
+    def cache_namespace(self, model_name):
+        return self.inner.cache_namespace(model_name)
+
+
+# ---------------------------------------------------------
+# Selection
+# ---------------------------------------------------------
+
+_BACKENDS: Dict[str, LLMBackend] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def backend_name() -> str:
+    return (os.environ.get("MATCHMYJD_LLM_BACKEND") or LLM_BACKEND).lower()
+
+
+def _with_hedging(backend: LLMBackend, scheduler=None) -> LLMBackend:
+    """
+    Hedged (when enabled) and / or scheduled backend. With hedging, every
+    attempt is scheduled on its own: the hedge delay tracks SDK latency
+    only, and a losing duplicate leaves the queue instead of retrying.
+    """
+    if LLM_HEDGING["enabled"]:
+        from core.llm_hedging import HedgedBackend
+        return HedgedBackend(backend, scheduler=scheduler)
+    return backend if scheduler is None else ScheduledBackend(backend, scheduler)
+
+
+def create_backend(name: str) -> LLMBackend:
+    if name == "gemini":
+        scheduler = None
+        if LLM_RATE_LIMITS["enabled"]:
+            from core.llm_scheduler import get_llm_scheduler
+            scheduler = get_llm_scheduler()
+        return _with_hedging(GeminiBackend(), scheduler)
+    if name == "local":
+        return LocalBackend()
+    if name == "fake":
+        from core.llm_hedging import FakeLatencyBackend, tail_latency_sampler
+        return _with_hedging(FakeLatencyBackend(LocalBackend(), tail_latency_sampler(**LLM_FAKE_LATENCY)))
+    if name == "replay":
+        fallback = create_backend(LLM_REPLAY_FALLBACK) if LLM_REPLAY_FALLBACK else None
+        return ReplayBackend(fallback=fallback)
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def get_llm_backend(name: Optional[str] = None) -> LLMBackend:
+    """Process-wide backend instance (one per name)."""
+    name = (name or backend_name()).lower()
+    with _BACKENDS_LOCK:
+        if name not in _BACKENDS:
+            _BACKENDS[name] = create_backend(name)
+            logger.info(f"LLM backend: {name}")
+        return _BACKENDS[name]
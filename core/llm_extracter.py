@@ -1,24 +1,18 @@
 import json
-from pathlib import Path
-from utils.json_extractor import extract_json_block
+from typing import Optional
+
+from config.settings import GEMINI_MODEL_JD, STRUCTURED_OUTPUT
+from core.llm_backend import get_llm_backend
+from utils.json_extractor import extract_json_from_text
 from utils.logger import get_logger
+from utils.schema import SCHEMA_DIR, get_validator, load_schema
 
 logger = get_logger(__name__)
 
-SCHEMA_DIR = Path("schemas")
-
-
-def load_schema(schema_name: str) -> dict:
-    with open(SCHEMA_DIR / schema_name, "r") as f:
-        return json.load(f)
 
-
-def call_llm(prompt: str) -> str:
-    """
-    TEMP implementation.
-    Replace this with OpenAI / Ollama / Together / Groq call.
-    """
-    raise NotImplementedError("LLM call not wired yet")
+def call_llm(prompt: str, model_name: str = GEMINI_MODEL_JD, generation_config: Optional[dict] = None) -> str:
+    """Single LLM call through the configured backend (see core/llm_backend.py)."""
+    return get_llm_backend().generate(model_name, prompt, generation_config)
 
 
 def extract_with_schema(text: str, schema_file: str, system_prompt: str) -> dict:
@@ -34,12 +28,17 @@ Return ONLY valid JSON that strictly follows this schema:
 {json.dumps(schema, indent=2)}
 """
 
-    raw_response = call_llm(prompt)
+    generation_config = {"response_mime_type": "application/json"} if STRUCTURED_OUTPUT else None
+    raw_response = call_llm(prompt, generation_config=generation_config)
 
-    json_data = extract_json_block(raw_response)
+    json_data = extract_json_from_text(raw_response)
     if not json_data:
         raise ValueError("Failed to extract JSON from LLM response")
 
+    errors = get_validator(schema_file)(json_data)
+    if errors:
+        raise ValueError(f"LLM response does not match {schema_file}: {errors[:3]}")
+
     return json_data
 def extract_jd_structured(jd_text: str) -> dict:
     system_prompt = """
@@ -0,0 +1,233 @@
+"""
+core/llm_hedging.py
+-------------------
+Hedged LLM requests + per-call timeouts, and a latency-injecting fake
+backend to test them offline.
+
+Hedging (LLM_HEDGING["enabled"]):
+- the primary request is sent; if it has not returned after the
+  hedge delay (rolling `percentile` of recent successful latencies,
+  floored at min_delay_seconds), one duplicate is sent and the first
+  successful response wins
+- duplicates are capped by a budget: hedges ≤ max_extra_ratio × requests.
+  The hedge percentile is raised to at least 100 × (1 − max_extra_ratio),
+  so hedges are not all spent on requests that are merely slowish
+- every call has a hard deadline (timeout_seconds) → LLMTimeoutError
+
+With a scheduler (core/llm_scheduler.py), each attempt is scheduled on
+its own, inside the call's deadline: latency samples time the SDK call
+only (not queueing or backoff), and once the race is decided the loser
+leaves the queue / stops retrying. An SDK call already in flight cannot
+be interrupted; it ends by its (deadline-capped) timeout and its result
+is discarded.
+
+Streams are hedged as whole responses: with hedging on, generate_stream
+yields the winning response as a single chunk.
+
+Fake backend for tests / benchmarks:
+    FakeLatencyBackend(LocalBackend(), tail_latency_sampler(2.0, 0.05, 20.0))
+See benchmarks/llm_hedging.py.
+"""
+
+import contextvars
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+from config.settings import LLM_HEDGING, debug_log
+from core.llm_backend import LLMBackend, estimate_call_tokens
+from core.llm_scheduler import LLMTimeoutError
+from utils import metrics
+
+
+# ---------------------------------------------------------
+# Rolling latency window
+# ---------------------------------------------------------
+
+class LatencyTracker:
+
+    def __init__(self, window: int = LLM_HEDGING["window"]):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(0, math.ceil(p / 100.0 * len(samples)) - 1)
+        return samples[rank]
+
+
+# ---------------------------------------------------------
+# Hedged backend
+# ---------------------------------------------------------
+
+class HedgedBackend(LLMBackend):
+
+    def __init__(self, inner: LLMBackend, settings: Optional[dict] = None, scheduler=None):
+        self.inner = inner
+        self.scheduler = scheduler
+        self.name = inner.name
+        self.cfg = {**LLM_HEDGING, **(settings or {})}
+
+        self.tracker = LatencyTracker(self.cfg["window"])
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.cfg["max_workers"],
+            thread_name_prefix="llm-hedge"
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+
+    def cache_namespace(self, model_name):
+        return self.inner.cache_namespace(model_name)
+
+    def hedge_percentile(self) -> float:
+        # Below this, more requests would qualify for a hedge than the budget allows
+        return max(self.cfg["percentile"], 100.0 * (1.0 - self.cfg["max_extra_ratio"]))
+
+    def hedge_delay(self) -> float:
+        if len(self.tracker) < self.cfg["min_samples"]:
+            return self.cfg["initial_delay_seconds"]
+        return max(self.cfg["min_delay_seconds"], self.tracker.percentile(self.hedge_percentile()))
+
+    def _take_hedge_budget(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.cfg["max_extra_ratio"] * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _timed_call(self, model_name, prompt, generation_config) -> str:
+        start = time.monotonic()
+        result = self.inner.generate(model_name, prompt, generation_config)
+        elapsed = time.monotonic() - start
+        self.tracker.record(elapsed)
+        metrics.observe("llm.latency_seconds", elapsed)
+        return result
+
+    def _attempt(self, model_name, prompt, generation_config, deadline: float, cancelled: threading.Event) -> str:
+        def call():
+            result = self._timed_call(model_name, prompt, generation_config)
+            # Before the scheduler slot is released, so a queued duplicate never takes it
+            cancelled.set()
+            return result
+
+        if self.scheduler is None:
+            return call()
+        return self.scheduler.call(
+            call,
+            estimate_call_tokens(prompt, generation_config),
+            deadline=deadline,
+            cancelled=cancelled
+        )
+
+    def _submit(self, model_name, prompt, generation_config, deadline, cancelled):
+        # Carry the caller's context (e.g. llm_priority) into the worker thread
+        ctx = contextvars.copy_context()
+        return self._pool.submit(
+            ctx.run, self._attempt, model_name, prompt, generation_config, deadline, cancelled
+        )
+
+    def generate(self, model_name, prompt, generation_config=None):
+        timeout = self.cfg["timeout_seconds"]
+        deadline = time.monotonic() + timeout
+        # Set by the winning attempt (or when giving up): the loser leaves the scheduler
+        cancelled = threading.Event()
+        with self._lock:
+            self.requests += 1
+
+        try:
+            primary = self._submit(model_name, prompt, generation_config, deadline, cancelled)
+            pending = {primary}
+
+            done, _ = wait(pending, timeout=min(self.hedge_delay(), timeout))
+            if not done and self._take_hedge_budget():
+                metrics.increment("llm.hedges_sent")
+                debug_log(f"Hedging LLM call after {self.hedge_delay():.2f}s")
+                pending.add(self._submit(model_name, prompt, generation_config, deadline, cancelled))
+
+            error: Optional[BaseException] = None
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is not primary:
+                            metrics.increment("llm.hedge_wins")
+                        return future.result()
+                    error = future.exception()
+
+            if not pending and error is not None:
+                raise error
+
+            metrics.increment("llm.timeouts")
+            raise LLMTimeoutError(f"LLM call exceeded {timeout:g}s")
+        finally:
+            cancelled.set()
+
+    def generate_stream(self, model_name, prompt, generation_config=None):
+        yield self.generate(model_name, prompt, generation_config)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "extra_ratio": round(self.hedges / self.requests, 3) if self.requests else 0.0,
+                "hedge_delay": round(self.hedge_delay(), 3)
+            }
+
+
+# ---------------------------------------------------------
+# Fake backend with injected latency
+# ---------------------------------------------------------
+
+def tail_latency_sampler(
+    median_seconds: float,
+    tail_probability: float,
+    tail_seconds: float,
+    sigma: float = 0.3,
+    seed: Optional[int] = None
+) -> Callable[[], float]:
+    """Log-normal body around `median_seconds`; with `tail_probability`, a ~`tail_seconds` straggler."""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def sample() -> float:
+        with lock:
+            if rng.random() < tail_probability:
+                return tail_seconds * rng.uniform(0.8, 1.2)
+            return median_seconds * math.exp(rng.gauss(0.0, sigma))
+
+    return sample
+
+
+class FakeLatencyBackend(LLMBackend):
+    """Wraps another backend (usually LocalBackend) and sleeps a sampled latency per call."""
+
+    def __init__(self, inner: LLMBackend, sampler: Callable[[], float]):
+        self.inner = inner
+        self.sampler = sampler
+        self.name = f"fake[{inner.name}]"
+
+    def cache_namespace(self, model_name):
+        return f"fake/{model_name}"
+
+    def generate(self, model_name, prompt, generation_config=None):
+        time.sleep(self.sampler())
+        return self.inner.generate(model_name, prompt, generation_config)
@@ -0,0 +1,375 @@
+"""
+core/llm_scheduler.py
+---------------------
+Shared scheduler for every LLM call (JD analyzer, resume analyzer,
+llm_extracter) when the Gemini backend is in use.
+
+- Token buckets: requests/min and estimated tokens/min (prompt estimate
+  + expected output), refilled continuously
+- Priority queue: INTERACTIVE (single matches) is always served before
+  BATCH (backfill); FIFO within a priority
+- Exponential backoff with full jitter on 429 / 5xx, so quota errors
+  cost a wait, not a parse retry or a crash
+- AIMD concurrency: +1 slot per `limit` successful calls,
+  × decrease_factor on every throttle (other failures leave it as is)
+- Optional per-call deadline covering queueing, backoff and retries:
+  a retry that cannot start before the deadline is not attempted, and
+  each attempt's SDK timeout is capped at the time left
+  (attempt_timeout) → LLMTimeoutError
+- Optional cancel event (hedged duplicates that lost the race): the
+  call leaves the queue / stops retrying → LLMCallCancelled
+
+Priority is taken from the calling context:
+
+    with llm_priority(BATCH):
+        analyze_jd(...)
+
+SDK timeouts (DeadlineExceeded) are not retried here: the backend maps
+them to LLMTimeoutError and the analyzers retry once.
+
+Metrics (utils/metrics.py): llm.queue_depth, llm.inflight,
+llm.concurrency_limit, llm.wait_seconds, llm.throttled, llm.backoff_seconds.
+"""
+
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from config.settings import LLM_RATE_LIMITS, debug_log
+from utils import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+INTERACTIVE = 0
+BATCH = 10
+
+# Short wait between cancel checks while queued (seconds)
+_CANCEL_POLL_SECONDS = 0.25
+
+_PRIORITY: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+# Deadline (time.monotonic()) of the attempt running on this thread
+_ATTEMPT_DEADLINE: contextvars.ContextVar = contextvars.ContextVar("llm_attempt_deadline", default=None)
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+class LLMCallCancelled(Exception):
+    pass
+
+
+@contextmanager
+def llm_priority(priority: int):
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority() -> int:
+    return _PRIORITY.get()
+
+
+def attempt_timeout(default: float) -> float:
+    """SDK timeout for the current attempt: `default`, capped by the call's deadline."""
+    deadline = _ATTEMPT_DEADLINE.get()
+    if deadline is None:
+        return default
+    return max(0.0, min(default, deadline - time.monotonic()))
+
+
+def _check_budget(deadline: Optional[float], cancelled: Optional[threading.Event]) -> None:
+    if cancelled is not None and cancelled.is_set():
+        raise LLMCallCancelled("LLM call cancelled")
+    if deadline is not None and time.monotonic() >= deadline:
+        metrics.increment("llm.deadline_exceeded")
+        raise LLMTimeoutError("LLM call deadline passed before it could be sent")
+
+
+# ---------------------------------------------------------
+# Throttle detection
+# ---------------------------------------------------------
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+    "InternalServerError", "BadGateway", "GatewayTimeout",
+}
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for attr in ("code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    return _status_code(exc) in _RETRYABLE_STATUS or type(exc).__name__ in _RETRYABLE_NAMES
+
+
+def is_throttle(exc: BaseException) -> bool:
+    return _status_code(exc) == 429 or type(exc).__name__ in {"ResourceExhausted", "TooManyRequests"}
+
+
+def is_deadline(exc: BaseException) -> bool:
+    """SDK-side request timeout (google.api_core DeadlineExceeded)."""
+    return type(exc).__name__ == "DeadlineExceeded"
+
+
+# ---------------------------------------------------------
+# Token bucket
+# ---------------------------------------------------------
+
+class TokenBucket:
+    """`per_minute` units/min, burst up to `capacity` (default: one minute's worth)."""
+
+    def __init__(self, per_minute: Optional[float], capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0 if per_minute else None
+        self.capacity = capacity or per_minute or 0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 → available now)."""
+        if self.rate is None:
+            return 0.0
+        self._refill(now)
+        # Requests larger than the bucket are let through once it is full
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        if self.rate is not None:
+            self.level -= min(amount, self.capacity)
+
+
+# ---------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------
+
+class LLMScheduler:
+
+    def __init__(self, limits: Optional[dict] = None):
+        cfg = {**LLM_RATE_LIMITS, **(limits or {})}
+        self.cfg = cfg
+
+        self._requests = TokenBucket(cfg["rpm"])
+        self._tokens = TokenBucket(cfg["tpm"])
+
+        self.min_concurrency = cfg["min_concurrency"]
+        self.max_concurrency = cfg["max_concurrency"]
+        self.limit = float(cfg["initial_concurrency"])
+        self.inflight = 0
+
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    # ---------------------------------------------------------
+    # Admission
+    # ---------------------------------------------------------
+
+    def _publish(self) -> None:
+        metrics.set_gauge("llm.queue_depth", len(self._queue))
+        metrics.set_gauge("llm.inflight", self.inflight)
+        metrics.set_gauge("llm.concurrency_limit", round(self.limit, 2))
+
+    def acquire(
+        self,
+        est_tokens: int,
+        priority: Optional[int] = None,
+        deadline: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Blocks until this request is at the head of the queue, a slot is free
+        and both buckets allow it. Leaves the queue with LLMTimeoutError /
+        LLMCallCancelled once `deadline` passes or `cancelled` is set.
+        """
+        priority = current_priority() if priority is None else priority
+        entry = (priority, next(self._seq))
+        queued_at = time.monotonic()
+
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            self._publish()
+
+            while True:
+                try:
+                    _check_budget(deadline, cancelled)
+                except Exception:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._publish()
+                    self._cond.notify_all()
+                    raise
+
+                timeout = None
+                if self._queue[0] == entry and self.inflight < int(self.limit):
+                    now = time.monotonic()
+                    timeout = max(
+                        self._requests.wait_time(1, now),
+                        self._tokens.wait_time(est_tokens, now)
+                    )
+                    if timeout == 0:
+                        break
+
+                if deadline is not None:
+                    left = deadline - time.monotonic()
+                    timeout = left if timeout is None else min(timeout, left)
+                if cancelled is not None:
+                    timeout = _CANCEL_POLL_SECONDS if timeout is None else min(timeout, _CANCEL_POLL_SECONDS)
+                self._cond.wait(timeout)
+
+            heapq.heappop(self._queue)
+            self._requests.take(1)
+            self._tokens.take(est_tokens)
+            self.inflight += 1
+            self._publish()
+            # The next request in line may be admissible too
+            self._cond.notify_all()
+
+        metrics.observe("llm.wait_seconds", time.monotonic() - queued_at)
+
+    def release(self, success: bool = True, throttled: bool = False) -> None:
+        with self._cond:
+            self.inflight -= 1
+            if throttled:
+                self.limit = max(self.min_concurrency, self.limit * self.cfg["decrease_factor"])
+            elif success:
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self._publish()
+            self._cond.notify_all()
+
+    def _backoff(
+        self,
+        attempt: int,
+        exc: BaseException,
+        deadline: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> None:
+        """Sleeps before a retry; re-raises `exc` if the retry could not start before the deadline."""
+        cap = min(self.cfg["backoff_max_seconds"], self.cfg["backoff_base_seconds"] * (2 ** attempt))
+        delay = random.uniform(0, cap)
+        if is_throttle(exc):
+            metrics.increment("llm.throttled")
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            logger.warning(f"⏳ LLM call failed ({type(exc).__name__}), no time left before the deadline to retry")
+            raise exc
+        metrics.observe("llm.backoff_seconds", delay)
+        logger.warning(f"⏳ LLM call failed ({type(exc).__name__}), retry {attempt + 1} in {delay:.1f}s")
+        if cancelled is None:
+            time.sleep(delay)
+        elif cancelled.wait(delay):
+            raise LLMCallCancelled("LLM call cancelled")
+
+    def _run_attempt(self, fn: Callable[[], T], deadline: Optional[float]) -> T:
+        # attempt_timeout() inside fn caps the SDK timeout at the time left
+        token = _ATTEMPT_DEADLINE.set(deadline)
+        try:
+            return fn()
+        finally:
+            _ATTEMPT_DEADLINE.reset(token)
+
+    # ---------------------------------------------------------
+    # Calls
+    # ---------------------------------------------------------
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        est_tokens: int,
+        priority: Optional[int] = None,
+        deadline: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> T:
+        """
+        Runs fn() under the limits, retrying 429 / 5xx with backoff.
+        deadline: time.monotonic() by which the call must finish.
+        """
+        for attempt in range(self.cfg["max_retries"] + 1):
+            self.acquire(est_tokens, priority, deadline, cancelled)
+            try:
+                result = self._run_attempt(fn, deadline)
+            except Exception as e:
+                self.release(success=False, throttled=is_throttle(e))
+                if not is_retryable(e) or attempt == self.cfg["max_retries"]:
+                    raise
+                self._backoff(attempt, e, deadline, cancelled)
+                continue
+            self.release()
+            return result
+        raise AssertionError("unreachable")
+
+    def stream(
+        self,
+        open_stream: Callable[[], Iterable[str]],
+        est_tokens: int,
+        priority: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Streamed variant: the slot is held until the consumer stops reading.
+        Errors before the first chunk are retried like call(); later ones propagate.
+        """
+        for attempt in range(self.cfg["max_retries"] + 1):
+            self.acquire(est_tokens, priority, deadline)
+            started = False
+            failed = False
+            throttled = False
+            try:
+                for chunk in self._run_attempt(open_stream, deadline):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                failed = True
+                throttled = is_throttle(e)
+                if started or not is_retryable(e) or attempt == self.cfg["max_retries"]:
+                    raise
+                retry_error = e
+            finally:
+                self.release(success=not failed, throttled=throttled)
+            self._backoff(attempt, retry_error, deadline)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "inflight": self.inflight,
+                "concurrency_limit": round(self.limit, 2)
+            }
+
+
+# ---------------------------------------------------------
+# Shared instance
+# ---------------------------------------------------------
+
+_SCHEDULER: Optional[LLMScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = LLMScheduler()
+            debug_log(f"LLM scheduler ready: {_SCHEDULER.cfg}")
+    return _SCHEDULER
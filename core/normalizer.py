@@ -5,10 +5,20 @@ Purpose:
 - Clean, unify, tokenize, normalize skill names
 - Handle synonyms so matching becomes accurate
 - Convert resume + JD skill lists into canonical form
+
+Lookups go through a precompiled reverse index (cleaned variant →
+canonical) built once from SYNONYMS and config.settings.SKILL_SYNONYMS,
+so normalize_skill is O(1) per call and memoized.
+External ontologies (10k+ skills) can be merged with load_ontology().
 """
 
+import csv
+import json
 import re
-from config.settings import debug_log
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+from config.settings import SKILL_SYNONYMS, NORMALIZER_CACHE_SIZE, debug_log
 
 
 # -----------------------------------------------------------
@@ -43,52 +53,127 @@ SYNONYMS = {**CANONICAL_SKILLS, **PROGRAMMING_SYNONYMS}
 # BASIC CLEANER
 # -----------------------------------------------------------
 
+_NON_ALNUM = re.compile(r"[^a-z0-9+]+")     # keep alphanumerics & +
+_MULTI_SPACE = re.compile(r"\s+")
+
+
 def clean_skill(s: str) -> str:
     s = s.lower().strip()
-    s = re.sub(r"[^a-z0-9+]+", " ", s)     # keep alphanumerics & +
-    s = re.sub(r"\s+", " ", s)
+    s = _NON_ALNUM.sub(" ", s)
+    s = _MULTI_SPACE.sub(" ", s)
     return s.strip()
 
 
+# -----------------------------------------------------------
+# REVERSE INDEX (cleaned variant → canonical)
+# -----------------------------------------------------------
+
+_INDEX: Dict[str, str] = {}
+
+
+def _add_entry(index: Dict[str, str], canonical: str, variants: Iterable[str], override: bool) -> None:
+    canonical = clean_skill(canonical)
+    if not canonical:
+        return
+
+    # Canonical names resolve to themselves (never overridden by variants)
+    index.setdefault(canonical, canonical)
+
+    for v in variants:
+        key = clean_skill(v)
+        if not key or key in SYNONYMS:
+            continue
+        if override or key not in index:
+            index[key] = canonical
+
+
+def _build_index() -> Dict[str, str]:
+    index: Dict[str, str] = {}
+
+    # Module lexicons take priority
+    for canonical, variants in SYNONYMS.items():
+        _add_entry(index, canonical, variants, override=False)
+
+    # settings.SKILL_SYNONYMS (variant → canonical): only fills gaps,
+    # and its targets are themselves resolved through the index
+    for variant, canonical in SKILL_SYNONYMS.items():
+        target = index.get(clean_skill(canonical), clean_skill(canonical))
+        _add_entry(index, target, [variant], override=False)
+
+    return index
+
+
+def load_ontology(path: str, override: bool = False) -> int:
+    """
+    Merges an external skill ontology into the index.
+
+    Supported formats:
+    - JSON: {"canonical": ["variant", ...], ...}
+    - CSV/TSV: one row per skill → canonical,variant1,variant2,...
+
+    Returns the number of index entries after loading.
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f).items()
+    else:
+        delimiter = "\t" if path.endswith(".tsv") else ","
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            entries = [(row[0], row[1:]) for row in csv.reader(f, delimiter=delimiter) if row]
+
+    for canonical, variants in entries:
+        _add_entry(_INDEX, canonical, variants, override=override)
+
+    _normalize_cached.cache_clear()
+    debug_log(f"Loaded skill ontology from {path} ({len(_INDEX)} index entries)")
+    return len(_INDEX)
+
+
 # -----------------------------------------------------------
 # MAP skill → canonical version
 # -----------------------------------------------------------
-def normalize_skill(skill: str) -> str:
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _normalize_cached(skill: str) -> str:
     cleaned = clean_skill(skill)
-    
+
     # --- SPECIAL RULES ---
     # Always treat Python as a tool, not a hard skill
-    
     if cleaned == "python":
         return "python"   # normalized canonical form
 
-    # Direct match
-    if cleaned in SYNONYMS:
-        return cleaned
-
-    # Synonym lookup
-    for canonical, variants in SYNONYMS.items():
-        if cleaned == canonical:
-            return canonical
-        for v in variants:
-            if cleaned == clean_skill(v):
-                return canonical
+    return _INDEX.get(cleaned, cleaned)  # fallback: cleaned input
 
-    return cleaned  # fallback
 
+def normalize_skill(skill: str) -> str:
+    return _normalize_cached(skill)
 
 
 # -----------------------------------------------------------
 # Normalize a list
 # -----------------------------------------------------------
 
-def normalize_skill_list(skills: list[str]) -> list[str]:
-    normalized = []
-    for s in skills:
-        ns = normalize_skill(s)
-        normalized.append(ns)
-        debug_log(f"Normalized: {s} → {ns}")
-    return list(set(normalized))  # unique
+def mentions_known_skill(text: str, max_words: int = 4) -> bool:
+    """True if any word n-gram (up to max_words) of text is a known skill variant."""
+    words = clean_skill(text).split()
+    for n in range(1, max_words + 1):
+        for i in range(len(words) - n + 1):
+            if " ".join(words[i:i + n]) in _INDEX:
+                return True
+    return False
+
+
+def normalize_skill_list(skills: List[str]) -> List[str]:
+    """
+    Bulk normalization: each distinct input is normalized once,
+    result is the unique set of canonical skills.
+    """
+    normalized = {normalize_skill(s) for s in dict.fromkeys(skills)}
+    debug_log(f"Normalized {len(skills)} skills → {len(normalized)} canonical")
+    return list(normalized)
+
+
+_INDEX.update(_build_index())
 
 
 # -----------------------------------------------------------
@@ -5,29 +5,38 @@ Chunked Resume Analyzer (PRODUCTION SAFE)
 
 Strategy:
 - Split resume into sections
-- Run Gemini per section
-- Merge JSON safely
+- Run the LLM backend per section (concurrently, capped)
+  OR pack sections into as few prompts as the token budget allows
+- Merge JSON safely in deterministic section order
 """
 
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
-from config.settings import GEMINI_MODEL_RESUME, MAX_TOKENS_RESUME, debug_log
-from utils.json_extractor import extract_json_from_text
-from utils.helpers import split_resume_into_sections
+from config.settings import (
+    GEMINI_MODEL_RESUME,
+    MAX_TOKENS_RESUME,
+    MAX_TOKENS_RESUME_PACKED,
+    RESUME_ANALYSIS_CONCURRENCY,
+    RESUME_ANALYSIS_MODE,
+    LLM_STREAM_RESPONSES,
+    STRUCTURED_OUTPUT,
+    debug_log
+)
+from core.llm_backend import get_llm_backend
+from core.llm_scheduler import current_priority, llm_priority
+from utils.json_extractor import extract_json_with_status
+from utils.json_stream import read_json_stream
+from utils.helpers import split_resume_into_sections, estimate_tokens
+from utils import metrics
+from utils.llm_cache import get_llm_cache, make_cache_key
+from utils.schema import coerce_to_schema, get_validator, load_schema
 
+RESUME_SCHEMA = "resume_schema.json"
 
-# ---------------------------------------------------------
-# GEMINI CONFIG
-# ---------------------------------------------------------
-
-def configure_gemini():
-    load_dotenv()
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise RuntimeError("Missing GEMINI_API_KEY")
-    genai.configure(api_key=api_key)
+# skills_with_evidence is a free-form map, which Gemini response schemas
+# cannot express → JSON mime type only; shape is checked by the validator
+_JSON_MIME = {"response_mime_type": "application/json"} if STRUCTURED_OUTPUT else {}
 
 
 # ---------------------------------------------------------
@@ -61,13 +70,328 @@ SECTION TEXT:
 """
 
 
+def build_packed_resume_prompt(sections: List[Tuple[str, str]]) -> str:
+    names = ", ".join(f'"{name}"' for name, _ in sections)
+    body = "\n\n".join(
+        f"=== SECTION: {name} ===\n{text}" for name, text in sections
+    )
+    return f"""
+You are an expert technical resume reviewer.
+
+You are analyzing {len(sections)} resume sections. Treat each section independently.
+
+Rules:
+- Return ONLY valid JSON
+- DO NOT hallucinate
+- ONLY include skills with CLEAR evidence in the section they appear in
+- Skills must be concise (1–3 words)
+
+Return ONE JSON object keyed by section name ({names}).
+Each value must have EXACTLY this structure:
+
+{{
+  "skills_with_evidence": {{
+    "skill_name": ["evidence"]
+  }},
+  "projects": [],
+  "tools": []
+}}
+
+{body}
+"""
+
+
+# ---------------------------------------------------------
+# PER-SECTION CALL
+# ---------------------------------------------------------
+
+MIN_SECTION_CHARS = 50
+
+GENERATION_CONFIG = {
+    "max_output_tokens": MAX_TOKENS_RESUME,
+    "temperature": 0.2,
+    **_JSON_MIME
+}
+
+
+class _ResumeLLM:
+    """
+    Backend + call options shared by every call of one analyze_resume run.
+    The caller's scheduling priority is captured here, since worker
+    threads do not inherit the caller's context.
+    """
+
+    def __init__(self, backend, stream: bool = LLM_STREAM_RESPONSES):
+        self.backend = backend
+        self.stream = stream
+        self.cache_model = backend.cache_namespace(GEMINI_MODEL_RESUME)
+        self.priority = current_priority()
+
+
+def _generate(llm: _ResumeLLM, prompt: str, generation_config: dict, cache) -> Tuple[str, str, bool, bool]:
+    """
+    Returns (raw_text, cache_key, from_cache, complete).
+    Callers store the response only once it has parsed successfully
+    and was not a repaired truncation (complete=False here, or
+    repaired=True from extract_json_with_status).
+
+    Streamed calls stop reading as soon as the top-level JSON object
+    closes; a truncated stream comes back structurally repaired.
+    ValueError if a streamed reply holds no JSON object at all.
+    """
+    cache_key = make_cache_key(llm.cache_model, prompt, generation_config)
+
+    raw = cache.get(cache_key) if cache is not None else None
+    if raw is not None:
+        return raw, cache_key, True, True
+
+    with llm_priority(llm.priority):
+        if not llm.stream:
+            return llm.backend.generate(GEMINI_MODEL_RESUME, prompt, generation_config), cache_key, False, True
+
+        raw, complete = read_json_stream(
+            llm.backend.generate_stream(GEMINI_MODEL_RESUME, prompt, generation_config)
+        )
+    return raw, cache_key, False, complete
+
+
+def _empty_section() -> dict:
+    return {"skills_with_evidence": {}, "projects": [], "tools": []}
+
+
+def _checked_section(parsed) -> Optional[dict]:
+    """
+    The parsed section, coerced to the schema if it fails validation
+    (e.g. a string instead of an evidence list). None if not coercible.
+    """
+    errors = get_validator(RESUME_SCHEMA)(parsed)
+    if not errors:
+        return parsed
+
+    metrics.increment("resume.validation_failed")
+    debug_log(f"⚠️ Resume section failed schema validation: {errors[:3]}")
+    try:
+        coerced = coerce_to_schema(RESUME_SCHEMA, parsed)
+    except ValueError:
+        return None
+    metrics.increment("resume.coerced")
+    return coerced
+
+
+def _analyze_section(llm: _ResumeLLM, section_name: str, section_text: str, cache) -> Optional[dict]:
+    """
+    One section → schema-valid JSON. Invalid output is coerced to the
+    schema; unparsable output is retried once (uncached). A section that
+    still fails returns None; analyze_resume counts it and merges it as
+    empty rather than failing the whole resume.
+    """
+    prompt = build_resume_prompt(section_name, section_text)
+
+    for attempt in range(2):
+        if attempt:
+            metrics.increment("resume.retries")
+
+        try:
+            raw, cache_key, from_cache, complete = _generate(
+                llm, prompt, GENERATION_CONFIG, cache if attempt == 0 else None
+            )
+        except TimeoutError:
+            debug_log(f"⚠️ LLM call timed out for section {section_name} (attempt {attempt + 1})")
+            continue
+        except ValueError:
+            debug_log(f"⚠️ No JSON in response for section {section_name} (attempt {attempt + 1})")
+            continue
+
+        try:
+            parsed, repaired = extract_json_with_status(raw)
+        except ValueError:
+            parsed, repaired = None, False
+
+        # Truncated replies are used but never cached (nor trusted from it)
+        complete = complete and not repaired
+        if from_cache and repaired:
+            parsed = None
+
+        section = _checked_section(parsed) if parsed is not None else None
+        if section is not None:
+            if cache is not None and not from_cache and complete:
+                cache.set(cache_key, llm.cache_model, raw)
+            debug_log(f"Analyzed resume section: {section_name}")
+            return section
+
+        if from_cache:
+            cache.invalidate(cache_key)
+
+    metrics.increment("resume.failed")
+    debug_log(f"❌ No usable JSON for resume section {section_name} after retries → skipped")
+    return None
+
+
+# ---------------------------------------------------------
+# PACKED CALL (many sections → one request)
+# ---------------------------------------------------------
+
+PACKED_GENERATION_CONFIG = {
+    "max_output_tokens": MAX_TOKENS_RESUME_PACKED,
+    "temperature": 0.2,
+    **_JSON_MIME
+}
+
+
+def _pack_sections(
+    sections: List[Tuple[str, str]],
+    token_budget: int = MAX_TOKENS_RESUME
+) -> List[List[Tuple[str, str]]]:
+    """
+    Greedily groups consecutive sections so each pack stays within
+    `token_budget` estimated input tokens. Oversized sections get a
+    pack of their own. Order is preserved.
+    """
+    packs: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    used = 0
+
+    for name, text in sections:
+        cost = estimate_tokens(text)
+        if current and used + cost > token_budget:
+            packs.append(current)
+            current, used = [], 0
+        current.append((name, text))
+        used += cost
+
+    if current:
+        packs.append(current)
+    return packs
+
+
+def _parse_packed(raw: str, pack: List[Tuple[str, str]], complete: bool = True) -> List[Optional[dict]]:
+    """
+    Per-section results of a packed answer (None → missing). A repaired
+    (truncated) reply counts as missing throughout: the model may have
+    been cut off mid-section.
+    """
+    try:
+        parsed, repaired = extract_json_with_status(raw)
+    except Exception:
+        debug_log("⚠️ Packed resume response failed to parse")
+        return [None] * len(pack)
+
+    if repaired or not complete:
+        debug_log("⚠️ Packed resume response was truncated")
+        return [None] * len(pack)
+
+    if not isinstance(parsed, dict):
+        return [None] * len(pack)
+
+    return [_checked_section(parsed[name]) if name in parsed else None for name, _ in pack]
+
+
+def _analyze_pack(llm: _ResumeLLM, pack: List[Tuple[str, str]], cache) -> List[Optional[dict]]:
+    """
+    One Gemini call for the whole pack. Sections missing from the
+    packed answer (or all of them, if it timed out, doesn't parse or
+    was truncated) fall back to individual per-section calls.
+    """
+    if len(pack) == 1:
+        return [_analyze_section(llm, pack[0][0], pack[0][1], cache)]
+
+    prompt = build_packed_resume_prompt(pack)
+    results: List[Optional[dict]] = [None] * len(pack)
+    from_cache = False
+    try:
+        raw, cache_key, from_cache, complete = _generate(llm, prompt, PACKED_GENERATION_CONFIG, cache)
+        results = _parse_packed(raw, pack, complete)
+    except TimeoutError:
+        debug_log(f"⚠️ Packed LLM call timed out ({len(pack)} sections)")
+    except ValueError:
+        debug_log("⚠️ No JSON in packed resume response")
+
+    if all(r is not None for r in results):
+        if cache is not None and not from_cache and complete:
+            cache.set(cache_key, llm.cache_model, raw)
+        debug_log(f"Analyzed {len(pack)} resume sections in one packed call")
+        return results
+
+    if from_cache:
+        cache.invalidate(cache_key)
+
+    for i, (name, text) in enumerate(pack):
+        if results[i] is None:
+            debug_log(f"Falling back to per-section call: {name}")
+            results[i] = _analyze_section(llm, name, text, cache)
+    return results
+
+
+def _merge_section_result(final: dict, parsed: dict) -> None:
+    for skill, ev in parsed.get("skills_with_evidence", {}).items():
+        final["skills_with_evidence"].setdefault(skill, []).extend(ev)
+
+    final["projects"].extend(parsed.get("projects", []))
+    final["tools"].extend(parsed.get("tools", []))
+
+
 # ---------------------------------------------------------
 # MAIN ANALYSIS
 # ---------------------------------------------------------
 
-def analyze_resume(resume_text: str) -> dict:
-    debug_log("Starting chunked resume analysis...")
-    configure_gemini()
+def analysis_version(mode: str = RESUME_ANALYSIS_MODE) -> str:
+    """
+    Fingerprint of everything that shapes a resume analysis besides the
+    text: backend/model, prompt templates, mode, generation configs and
+    schema. Stored analyses (core/dedupe.py) are keyed by it.
+    """
+    backend = get_llm_backend()
+    return make_cache_key(
+        backend.cache_namespace(GEMINI_MODEL_RESUME),
+        build_resume_prompt("", "") + build_packed_resume_prompt([]),
+        {
+            "mode": mode,
+            "sections": GENERATION_CONFIG,
+            "packed": PACKED_GENERATION_CONFIG,
+            "schema": load_schema(RESUME_SCHEMA)
+        }
+    )[:16]
+
+
+def analyze_resume(
+    resume_text: str,
+    use_cache: bool = True,
+    max_concurrency: int = RESUME_ANALYSIS_CONCURRENCY,
+    mode: str = RESUME_ANALYSIS_MODE,
+    stream: bool = LLM_STREAM_RESPONSES
+) -> dict:
+    """Structured resume analysis (see analyze_resume_with_status)."""
+    return analyze_resume_with_status(resume_text, use_cache, max_concurrency, mode, stream)[0]
+
+
+def analyze_resume_with_status(
+    resume_text: str,
+    use_cache: bool = True,
+    max_concurrency: int = RESUME_ANALYSIS_CONCURRENCY,
+    mode: str = RESUME_ANALYSIS_MODE,
+    stream: bool = LLM_STREAM_RESPONSES
+) -> Tuple[dict, int]:
+    """
+    Returns (analysis, failed_sections). Sections that failed after
+    retries are merged as empty and counted, so callers that store the
+    analysis (core/dedupe.py) can skip degraded results.
+
+    Modes:
+    - "sections": one Gemini call per non-trivial section
+    - "packed":   sections packed into as few calls as MAX_TOKENS_RESUME
+                  allows (usually 1–2), falling back per section on parse failure
+
+    Calls fan out across up to `max_concurrency` threads (1 → sequential),
+    so latency tracks the slowest call instead of the sum of all.
+    Results are merged in section order regardless of completion order.
+
+    stream=True reads each response incrementally and stops at the
+    closing brace (see utils/json_stream.py).
+    """
+    debug_log(f"Starting chunked resume analysis (mode={mode})...")
+
+    if mode not in ("sections", "packed"):
+        raise ValueError(f"Unknown resume analysis mode: {mode}")
 
     # 🔒 SAFETY GUARD
     if isinstance(resume_text, dict):
@@ -77,6 +401,15 @@ def analyze_resume(resume_text: str) -> dict:
         raise TypeError(f"analyze_resume expected str, got {type(resume_text)}")
 
     sections = split_resume_into_sections(resume_text)
+    work = [
+        (name, text) for name, text in sections.items()
+        if len(text.strip()) >= MIN_SECTION_CHARS
+    ]
+
+    if mode == "packed":
+        packs = _pack_sections(work)
+    else:
+        packs = [[item] for item in work]
 
     final = {
         "skills_with_evidence": {},
@@ -84,35 +417,29 @@ def analyze_resume(resume_text: str) -> dict:
         "tools": []
     }
 
-    model = genai.GenerativeModel(GEMINI_MODEL_RESUME)
-
-    for section_name, section_text in sections.items():
-        if len(section_text.strip()) < 50:
-            continue
-
-        prompt = build_resume_prompt(section_name, section_text)
-
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "max_output_tokens": MAX_TOKENS_RESUME,
-                "temperature": 0.2
-            }
-        )
-
-        try:
-            raw = response.text
-        except AttributeError:
-            raw = response.candidates[0].content.parts[0].text
+    cache = get_llm_cache() if use_cache else None
+    llm = _ResumeLLM(get_llm_backend(), stream=stream)
 
-        parsed = extract_json_from_text(raw)
+    workers = max(1, min(max_concurrency or 1, len(packs)))
 
-        # --- merge safely ---
-        for skill, ev in parsed.get("skills_with_evidence", {}).items():
-            final["skills_with_evidence"].setdefault(skill, []).extend(ev)
+    if workers == 1:
+        results = [_analyze_pack(llm, pack, cache) for pack in packs]
+    else:
+        debug_log(f"Analyzing {len(work)} resume sections in {len(packs)} calls with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order → deterministic merge
+            results = list(pool.map(lambda pack: _analyze_pack(llm, pack, cache), packs))
 
-        final["projects"].extend(parsed.get("projects", []))
-        final["tools"].extend(parsed.get("tools", []))
+    failed_sections = 0
+    for pack_results in results:
+        for parsed in pack_results:
+            if parsed is None:
+                failed_sections += 1
+                parsed = _empty_section()
+            _merge_section_result(final, parsed)
 
-    debug_log("Resume analysis completed successfully.")
-    return final
+    if failed_sections:
+        debug_log(f"⚠️ Resume analysis completed with {failed_sections} failed section(s)")
+    else:
+        debug_log("Resume analysis completed successfully.")
+    return final, failed_sections
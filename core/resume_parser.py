@@ -17,7 +17,7 @@ Outputs:
 """
 
 import re
-import fitz  # PyMuPDF
+from typing import Optional
 from config.settings import RESUME_SECTIONS, debug_log
 
 
@@ -36,6 +36,16 @@ class ResumeParser:
         debug_log(f"Parsing resume: {pdf_path}")
 
         raw_text = self._extract_pdf_text(pdf_path)
+        return self._structure(raw_text)
+
+    def parse_bytes(self, data: bytes, source: str = "<bytes>") -> dict:
+        """Same as parse(), for PDF content already read into memory."""
+        debug_log(f"Parsing resume: {source}")
+
+        raw_text = self._extract_pdf_text(source, data=data)
+        return self._structure(raw_text)
+
+    def _structure(self, raw_text: str) -> dict:
         cleaned_text = self._clean_text(raw_text)
         sections = self._split_into_sections(cleaned_text)
 
@@ -49,17 +59,21 @@ class ResumeParser:
     # Extract text from PDF
     # ---------------------------------------------------------
 
-    def _extract_pdf_text(self, pdf_path: str) -> str:
-        doc = fitz.open(pdf_path)
-        text = ""
+    def _extract_pdf_text(self, pdf_path: str, data: Optional[bytes] = None) -> str:
+        import fitz  # PyMuPDF (deferred: only needed when a PDF is parsed)
+
+        if data is not None:
+            doc = fitz.open(stream=data, filetype="pdf")
+        else:
+            doc = fitz.open(pdf_path)
 
+        pages = []
         for page_num, page in enumerate(doc, start=1):
-            extracted = page.get_text("text")
-            text += extracted + "\n"
+            pages.append(page.get_text("text"))
             debug_log(f"Extracted page {page_num}")
 
         doc.close()
-        return text
+        return "".join(p + "\n" for p in pages)
 
     # ---------------------------------------------------------
     # Clean & normalize extracted text
@@ -95,8 +109,8 @@ class ResumeParser:
         lines = text.split("\n")
 
         current_section = "other"
-        sections = {sec: "" for sec in RESUME_SECTIONS}
-        sections["other"] = ""
+        sections = {sec: [] for sec in RESUME_SECTIONS}
+        sections["other"] = []
 
         for line in lines:
             lower = line.lower()
@@ -109,9 +123,9 @@ class ResumeParser:
                     break
             else:
                 # Add content into the active section
-                sections[current_section] += line + "\n"
+                sections[current_section].append(line)
 
-        return sections
+        return {sec: "".join(l + "\n" for l in content) for sec, content in sections.items()}
 
 
 # ---------------------------------------------------------
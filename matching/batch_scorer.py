@@ -0,0 +1,166 @@
+"""
+matching/batch_scorer.py
+------------------------
+Batch hybrid scoring: M JDs × N resumes in one vectorized pass.
+
+Same formula as hybrid_scorer.compute_hybrid_score, but:
+- resumes are pre-encoded once into features (bitset skill pool,
+  strong-evidence counts)
+- must-have coverage / nice-to-have bonus / evidence multiplier /
+  clamping are NumPy operations over all N resumes per JD
+- HR-readable explanations are generated only for the pairs the
+  caller asks for (e.g. the top K per JD)
+
+Typical nightly flow (structs analyzed at BATCH LLM priority, e.g.
+`python -m core.bulk_ingest ... --analyze` or inside
+`with llm_priority(BATCH):`, so interactive matches are served first):
+    resumes = build_resume_features(resume_structs)
+    jds = build_jd_features(jd_structs)
+    scores = compute_score_matrix(jds, resumes, semantic_matrix)   # (M, N)
+    top = top_k_pairs(scores, k=50)
+    details = explain_pairs(jd_structs, resume_structs, semantic_matrix, top)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from matching.hybrid_scorer import (
+    _compose_score,
+    _evidence_boost,
+    _nice_bonus_from_count,
+    _normalize_list,
+    _strong_evidence_count,
+    compute_hybrid_score
+)
+from matching.skill_vocab import ResumeBitsetPool, SkillVocabulary
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ---------------------------------------------------------
+# Feature builders
+# ---------------------------------------------------------
+
+def build_resume_features(
+    resume_structs: Sequence[Dict[str, Any]],
+    resume_ids: Optional[Sequence[str]] = None,
+    vocab: Optional[SkillVocabulary] = None
+) -> Dict[str, Any]:
+    """
+    {
+      "pool": ResumeBitsetPool (N packed skill bitsets),
+      "strong_evidence": (N,) int array
+    }
+    The skill vocabulary is built for this batch only (unless `vocab` is given).
+    """
+    pool = ResumeBitsetPool(vocab)
+    ids = resume_ids or [str(i) for i in range(len(resume_structs))]
+
+    strong = np.zeros(len(resume_structs), dtype=np.int64)
+    for i, (rid, resume_struct) in enumerate(zip(ids, resume_structs)):
+        skills_with_evidence = resume_struct.get("skills_with_evidence", {}) or {}
+        pool.add_skills(
+            rid,
+            _normalize_list(list(skills_with_evidence.keys())) +
+            _normalize_list(resume_struct.get("tools", []) or [])
+        )
+        strong[i] = _strong_evidence_count(skills_with_evidence)
+
+    return {
+        "pool": pool,
+        "strong_evidence": strong
+    }
+
+
+def build_jd_features(jd_structs: Sequence[Dict[str, Any]]) -> List[Dict[str, List[str]]]:
+    """Normalized must / nice skill lists per JD (duplicates kept, as in compute_hybrid_score)."""
+    features = []
+    for jd_struct in jd_structs:
+        features.append({
+            "must": _normalize_list(jd_struct.get("must_have_skills", []) or []),
+            "nice": _normalize_list(jd_struct.get("nice_to_have_skills", []) or [])
+        })
+    return features
+
+
+# ---------------------------------------------------------
+# Score matrix
+# ---------------------------------------------------------
+
+def compute_score_matrix(
+    jd_features: List[Dict[str, List[str]]],
+    resume_features: Dict[str, Any],
+    semantic_matrix: np.ndarray,
+    weights: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    semantic_matrix: (M, N) precomputed semantic scores.
+    weights: overrides config.settings.HYBRID_SCORING.
+    Returns an (M, N) int matrix of overall scores.
+    """
+    pool: ResumeBitsetPool = resume_features["pool"]
+    semantic_matrix = np.asarray(semantic_matrix, dtype=np.float64)
+
+    M, N = len(jd_features), len(pool)
+    if semantic_matrix.shape != (M, N):
+        raise ValueError(f"semantic_matrix shape {semantic_matrix.shape} != ({M}, {N})")
+
+    must_cov = np.ones((M, N), dtype=np.float64)
+    nice_bonus = np.zeros((M, N), dtype=np.float64)
+
+    for m, jd in enumerate(jd_features):
+        if jd["must"]:
+            must_cov[m] = pool.match_counts(jd["must"]) / len(jd["must"])
+        if jd["nice"]:
+            nice_bonus[m] = _nice_bonus_from_count(pool.match_counts(jd["nice"]), weights)
+
+    scores = _compose_score(
+        must_cov,
+        semantic_matrix,
+        nice_bonus,
+        _evidence_boost(resume_features["strong_evidence"], weights)[None, :],
+        weights
+    )
+
+    logger.info(f"[BATCH] scored {M} JDs × {N} resumes")
+    return scores
+
+
+def top_k_pairs(score_matrix: np.ndarray, k: int) -> List[Tuple[int, int]]:
+    """(jd_index, resume_index) for the best k resumes of every JD, best first."""
+    M, N = score_matrix.shape
+    k = min(k, N)
+    if k <= 0:
+        return []
+
+    top = np.argpartition(-score_matrix, k - 1, axis=1)[:, :k]
+    pairs = []
+    for m in range(M):
+        order = top[m][np.argsort(-score_matrix[m, top[m]], kind="stable")]
+        pairs.extend((m, int(n)) for n in order)
+    return pairs
+
+
+# ---------------------------------------------------------
+# Explanations (only for requested pairs)
+# ---------------------------------------------------------
+
+def explain_pairs(
+    jd_structs: Sequence[Dict[str, Any]],
+    resume_structs: Sequence[Dict[str, Any]],
+    semantic_matrix: np.ndarray,
+    pairs: Sequence[Tuple[int, int]],
+    weights: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    results = []
+    for m, n in pairs:
+        result = compute_hybrid_score(
+            jd_struct=jd_structs[m],
+            resume_struct=resume_structs[n],
+            semantic_score=float(semantic_matrix[m][n]),
+            weights=weights
+        )
+        results.append({"jd_index": m, "resume_index": n, **result})
+    return results
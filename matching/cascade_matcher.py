@@ -0,0 +1,174 @@
+"""
+matching/cascade_matcher.py
+---------------------------
+Cascading per-skill matcher: EXACT → FUZZY → SEMANTIC
+
+Each JD skill is resolved by the cheapest layer that can:
+1) Exact   – canonical forms match (normalizer index, O(1) per skill)
+2) Fuzzy   – best token-Jaccard ≥ fuzzy_threshold (one sparse batch)
+3) Semantic – best embedding cosine ≥ semantic_threshold
+              (only the still-unresolved residue is embedded)
+
+Output: a per-skill match table consumed by hybrid_scorer:
+[
+  {"jd_skill": "...", "method": "exact|fuzzy|semantic|none",
+   "resume_skill": "..." | None, "score": float,
+   "similarity": float},
+  ...
+]
+
+"similarity" is the best similarity the cascade saw for the skill,
+even below threshold, on the embedding cosine scale: 1.0 for exact,
+cosine for the embedded residue, and for fuzzy matches the token
+Jaccard mapped linearly from [fuzzy_threshold, 1] onto
+[semantic_threshold, 1] (an accepted fuzzy match counts like an
+accepted semantic one). skill_similarity() turns a table into the
+semantic matcher's skills_vs_resume signal, so skills resolved by
+exact / fuzzy matching are never embedded.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from config.settings import CASCADE_MATCHING, debug_log
+from core.normalizer import normalize_skill
+from matching.matcher_fuzzy import best_fuzzy_matches
+
+
+def _entry(
+    jd_skill: str,
+    method: str,
+    resume_skill: Optional[str],
+    score: float,
+    similarity: Optional[float] = None
+) -> Dict[str, Any]:
+    return {
+        "jd_skill": jd_skill,
+        "method": method,
+        "resume_skill": resume_skill,
+        "score": round(float(score), 3),
+        "similarity": round(float(score if similarity is None else similarity), 3)
+    }
+
+
+def _fuzzy_as_cosine(score: float, fuzzy_threshold: float, semantic_threshold: float) -> float:
+    """Accepted token Jaccard → cosine scale used by "similarity"."""
+    if fuzzy_threshold >= 1.0:
+        return 1.0
+    frac = (score - fuzzy_threshold) / (1.0 - fuzzy_threshold)
+    return semantic_threshold + (1.0 - semantic_threshold) * min(1.0, max(0.0, frac))
+
+
+def resume_skill_pool(resume_struct: Dict[str, Any]) -> List[str]:
+    skills = list((resume_struct.get("skills_with_evidence", {}) or {}).keys())
+    tools = resume_struct.get("tools", []) or []
+    return [s for s in dict.fromkeys(skills + tools) if isinstance(s, str) and s.strip()]
+
+
+# ---------------------------------------------------------
+# Cascade
+# ---------------------------------------------------------
+
+def match_skills_cascade(
+    jd_skills: List[str],
+    resume_skills: List[str],
+    fuzzy_threshold: float = CASCADE_MATCHING["fuzzy_threshold"],
+    semantic_threshold: float = CASCADE_MATCHING["semantic_threshold"],
+    use_semantic: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Returns one table entry per JD skill, in input order.
+    """
+    jd_skills = [s for s in jd_skills if isinstance(s, str) and s.strip()]
+    table: List[Optional[Dict[str, Any]]] = [None] * len(jd_skills)
+
+    if not resume_skills:
+        return [_entry(s, "none", None, 0.0) for s in jd_skills]
+
+    # --- 1) Exact (canonical form) ---
+    canonical_resume: Dict[str, str] = {}
+    for r in resume_skills:
+        canonical_resume.setdefault(normalize_skill(r), r)
+
+    residue = []
+    for i, skill in enumerate(jd_skills):
+        match = canonical_resume.get(normalize_skill(skill))
+        if match is not None:
+            table[i] = _entry(skill, "exact", match, 1.0)
+        else:
+            residue.append(i)
+
+    # --- 2) Fuzzy (token Jaccard, batched) ---
+    if residue:
+        fuzzy = best_fuzzy_matches([jd_skills[i] for i in residue], resume_skills)
+        still = []
+        for i, (skill, match, score) in zip(residue, fuzzy):
+            if match is not None and score >= fuzzy_threshold:
+                similarity = _fuzzy_as_cosine(score, fuzzy_threshold, semantic_threshold)
+                table[i] = _entry(skill, "fuzzy", match, score, similarity)
+            else:
+                still.append(i)
+        residue = still
+
+    # --- 3) Semantic (embeddings for the residue only) ---
+    residue_sim: Dict[int, float] = {}
+    if residue and use_semantic:
+        from matching.matcher_semantic import similarity_matrix
+
+        sims = similarity_matrix([jd_skills[i] for i in residue], resume_skills)
+        best_idx = sims.argmax(axis=1)
+        still = []
+        for row, i in enumerate(residue):
+            score = float(sims[row, best_idx[row]])
+            if score >= semantic_threshold:
+                table[i] = _entry(jd_skills[i], "semantic", resume_skills[best_idx[row]], score)
+            else:
+                residue_sim[i] = max(0.0, score)
+                still.append(i)
+        residue = still
+
+    for i in residue:
+        table[i] = _entry(jd_skills[i], "none", None, 0.0, residue_sim.get(i, 0.0))
+
+    debug_log(
+        "[CASCADE] " + ", ".join(
+            f"{m}={sum(1 for e in table if e['method'] == m)}"
+            for m in ("exact", "fuzzy", "semantic", "none")
+        )
+    )
+    return table
+
+
+def match_jd_resume_skills(
+    jd_struct: Dict[str, Any],
+    resume_struct: Dict[str, Any],
+    use_semantic: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Match tables for both JD skill lists:
+    {"must_have": [...], "nice_to_have": [...]}
+    """
+    pool = resume_skill_pool(resume_struct)
+    must = jd_struct.get("must_have_skills", []) or []
+    nice = jd_struct.get("nice_to_have_skills", []) or []
+
+    # One cascade pass over both lists → one semantic batch for the residue
+    table = match_skills_cascade(must + nice, pool, use_semantic=use_semantic)
+    n_must = len([s for s in must if isinstance(s, str) and s.strip()])
+
+    return {
+        "must_have": table[:n_must],
+        "nice_to_have": table[n_must:]
+    }
+
+
+def skill_similarity(match_tables: Dict[str, List[Dict[str, Any]]]) -> float:
+    """
+    Best JD-skill ↔ resume-skill similarity over the cascade tables,
+    in [0, 1] on the cosine scale. Stands in for the embedding max-similarity of
+    semantic_match_components (same resume pool: evidence keys + tools).
+    """
+    best = 0.0
+    for entries in match_tables.values():
+        for e in entries:
+            best = max(best, e.get("similarity", e["score"]))
+    return min(1.0, best)
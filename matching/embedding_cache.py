@@ -0,0 +1,272 @@
+"""
+matching/embedding_cache.py
+---------------------------
+Two-tier embedding cache for the semantic matcher.
+
+Tier 1: in-process LRU keyed by (model name, normalized text)
+Tier 2: on-disk append-only vector store per model
+        - <slug>.vec  raw float32/float16 rows, opened with np.memmap
+        - <slug>.idx  one "row<TAB>json-text" line per vector
+        - <slug>.meta dim + dtype
+
+New processes map the vector file read-only, so warm vectors are
+available at zero copy; only unseen strings hit the encoder.
+Appends are serialized across processes with an advisory file lock
+(POSIX only; single-writer elsewhere).
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from config.settings import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_LRU_SIZE,
+    EMBEDDING_CACHE_DTYPE,
+    debug_log
+)
+
+
+def normalize_text_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class EmbeddingCache:
+
+    def __init__(
+        self,
+        model_name: str,
+        directory: str = EMBEDDING_CACHE_DIR,
+        lru_size: int = EMBEDDING_CACHE_LRU_SIZE,
+        dtype: str = EMBEDDING_CACHE_DTYPE
+    ):
+        self.model_name = model_name
+        self.lru_size = lru_size
+        self.dtype = np.dtype(dtype)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._rows: Dict[str, int] = {}
+        self._mmap: Optional[np.ndarray] = None
+        self._dim: Optional[int] = None
+        self._idx_offset = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        base = os.path.join(directory, slug)
+        self.vec_path = base + ".vec"
+        self.idx_path = base + ".idx"
+        self.meta_path = base + ".meta"
+
+        self._load_meta()
+        self._refresh_index()
+
+    # ---------------------------------------------------------
+    # Disk tier
+    # ---------------------------------------------------------
+
+    def _load_meta(self) -> None:
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self._dim = int(meta["dim"])
+        self.dtype = np.dtype(meta["dtype"])
+
+    def _write_meta(self) -> None:
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self._dim, "dtype": self.dtype.name, "model": self.model_name}, f)
+
+    def _row_bytes(self) -> int:
+        return self._dim * self.dtype.itemsize
+
+    def _available_rows(self) -> int:
+        if self._dim is None or not os.path.exists(self.vec_path):
+            return 0
+        return os.path.getsize(self.vec_path) // self._row_bytes()
+
+    def _refresh_index(self) -> None:
+        """Reads index lines appended since the last refresh (by any process)."""
+        if not os.path.exists(self.idx_path):
+            return
+
+        with open(self.idx_path, "r", encoding="utf-8") as f:
+            f.seek(self._idx_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written line; pick it up next time
+                row, key = line.rstrip("\n").split("\t", 1)
+                self._rows[json.loads(key)] = int(row)
+            self._idx_offset = f.tell()
+
+        self._mmap = None
+
+    def _vectors(self) -> Optional[np.ndarray]:
+        if self._mmap is None:
+            rows = self._available_rows()
+            if rows == 0:
+                return None
+            self._mmap = np.memmap(
+                self.vec_path, dtype=self.dtype, mode="r", shape=(rows, self._dim)
+            )
+        return self._mmap
+
+    def _read_row(self, key: str) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+
+        vectors = self._vectors()
+        if vectors is None or row >= vectors.shape[0]:
+            self._mmap = None
+            vectors = self._vectors()
+            if vectors is None or row >= vectors.shape[0]:
+                return None
+
+        vec = vectors[row]
+        return vec if self.dtype == np.float32 else vec.astype(np.float32)
+
+    # ---------------------------------------------------------
+    # LRU tier
+    # ---------------------------------------------------------
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+
+    def get_many(self, texts: List[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """
+        Returns ({text: vector} for cached texts, [texts to encode]).
+        Missing texts are deduplicated by normalized key.
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        missing_keys = set()
+
+        with self._lock:
+            refreshed = False
+            for text in texts:
+                key = normalize_text_key(text)
+
+                vec = self._lru.get(key)
+                if vec is not None:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    found[text] = vec
+                    continue
+
+                if key not in self._rows and not refreshed:
+                    self._refresh_index()
+                    refreshed = True
+
+                vec = self._read_row(key)
+                if vec is not None:
+                    self.disk_hits += 1
+                    self._remember(key, vec)
+                    found[text] = vec
+                    continue
+
+                if key not in missing_keys:
+                    self.misses += 1
+                    missing_keys.add(key)
+                    missing.append(text)
+
+        return found, missing
+
+    def put_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        if not texts:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(vectors.shape[1])
+                self._write_meta()
+
+            with open(self.idx_path, "a", encoding="utf-8") as idx_file:
+                if fcntl is not None:
+                    fcntl.flock(idx_file, fcntl.LOCK_EX)
+                try:
+                    self._refresh_index()
+
+                    new = []
+                    seen = set()
+                    for text, vec in zip(texts, vectors):
+                        key = normalize_text_key(text)
+                        self._remember(key, vec)
+                        if key not in self._rows and key not in seen:
+                            seen.add(key)
+                            new.append((key, vec))
+
+                    if new:
+                        start = self._available_rows()
+                        block = np.stack([v for _, v in new]).astype(self.dtype)
+                        with open(self.vec_path, "ab") as vec_file:
+                            vec_file.truncate(start * self._row_bytes())
+                            vec_file.write(block.tobytes())
+                            vec_file.flush()
+
+                        idx_file.write("".join(
+                            f"{start + i}\t{json.dumps(key, ensure_ascii=False)}\n"
+                            for i, (key, _) in enumerate(new)
+                        ))
+                        idx_file.flush()
+
+                        for i, (key, _) in enumerate(new):
+                            self._rows[key] = start + i
+                        self._idx_offset = os.path.getsize(self.idx_path)
+                        self._mmap = None
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(idx_file, fcntl.LOCK_UN)
+
+        debug_log(f"Embedding cache stored {len(texts)} vectors")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "lru_hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "lru_entries": len(self._lru),
+            "disk_entries": len(self._rows)
+        }
+
+
+# ---------------------------------------------------------
+# Shared per-model instances
+# ---------------------------------------------------------
+
+_CACHES: Dict[str, EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_embedding_cache(model_name: str) -> Optional[EmbeddingCache]:
+    if not EMBEDDING_CACHE_ENABLED or os.environ.get("MATCHMYJD_NO_CACHE") == "1":
+        return None
+
+    with _CACHES_LOCK:
+        if model_name not in _CACHES:
+            _CACHES[model_name] = EmbeddingCache(model_name)
+    return _CACHES[model_name]
@@ -0,0 +1,230 @@
+"""
+matching/feature_store.py
+-------------------------
+Local store of per-pair intermediate scoring features.
+
+For every scored (JD, resume) pair we persist the weight-independent
+features:
+- must_cov          fraction of must-have skills covered
+- nice_matches      number of nice-to-have skills matched
+- strong_evidence   skills backed by ≥2 pieces of evidence
+- resp_vs_projects  semantic: responsibilities vs projects/evidence
+- skills_vs_resume  semantic: JD skills vs resume skills/tools
+
+Rescoring under a new HYBRID_SCORING / SEMANTIC_SCORING config is then
+pure NumPy over stored rows — no Gemini, no encoder.
+
+CLI:
+    python -m matching.feature_store stats
+    python -m matching.feature_store rescore --weights new_weights.json
+      (JSON: {"hybrid": {...}, "semantic": {...}}, merged over settings)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config.settings import (
+    FEATURE_STORE_ENABLED,
+    FEATURE_STORE_PATH,
+    HYBRID_SCORING,
+    SEMANTIC_SCORING
+)
+from matching.hybrid_scorer import score_from_features
+from matching.matcher_semantic import combine_semantic
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FEATURE_COLUMNS = [
+    "must_cov",
+    "nice_matches",
+    "strong_evidence",
+    "resp_vs_projects",
+    "skills_vs_resume",
+]
+
+
+class FeatureStore:
+
+    def __init__(self, path: str = FEATURE_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pair_features (
+                jd_id TEXT NOT NULL,
+                resume_id TEXT NOT NULL,
+                must_cov REAL NOT NULL,
+                nice_matches INTEGER NOT NULL,
+                strong_evidence INTEGER NOT NULL,
+                resp_vs_projects REAL NOT NULL,
+                skills_vs_resume REAL NOT NULL,
+                overall_score INTEGER,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (jd_id, resume_id)
+            )
+            """
+        )
+        self._conn.commit()
+
+    # ---------------------------------------------------------
+    # Write / read
+    # ---------------------------------------------------------
+
+    def put(self, jd_id: str, resume_id: str, features: Dict[str, Any], overall_score: Optional[int] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"""
+                INSERT OR REPLACE INTO pair_features
+                (jd_id, resume_id, {", ".join(FEATURE_COLUMNS)}, overall_score, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    jd_id,
+                    resume_id,
+                    *(float(features[c]) for c in FEATURE_COLUMNS),
+                    overall_score,
+                    time.time()
+                )
+            )
+            self._conn.commit()
+
+    def get(self, jd_id: str, resume_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(FEATURE_COLUMNS)}, overall_score FROM pair_features "
+                "WHERE jd_id = ? AND resume_id = ?",
+                (jd_id, resume_id)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(FEATURE_COLUMNS + ["overall_score"], row))
+
+    def load_arrays(self) -> Dict[str, np.ndarray]:
+        """All rows as column arrays (plus jd_ids / resume_ids)."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT jd_id, resume_id, {', '.join(FEATURE_COLUMNS)} FROM pair_features"
+            ).fetchall()
+
+        cols = list(zip(*rows)) if rows else [[] for _ in range(2 + len(FEATURE_COLUMNS))]
+        arrays: Dict[str, np.ndarray] = {
+            "jd_ids": np.array(cols[0], dtype=object),
+            "resume_ids": np.array(cols[1], dtype=object)
+        }
+        for name, values in zip(FEATURE_COLUMNS, cols[2:]):
+            arrays[name] = np.array(values, dtype=np.float64)
+        return arrays
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pair_features").fetchone()[0]
+
+    # ---------------------------------------------------------
+    # Rescoring
+    # ---------------------------------------------------------
+
+    def rescore(
+        self,
+        hybrid_weights: Optional[Dict[str, Any]] = None,
+        semantic_weights: Optional[Dict[str, float]] = None,
+        write: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """
+        Recomputes every stored pair's overall score under new weights
+        (merged over settings). Returns {"jd_ids", "resume_ids", "overall_score"}.
+        """
+        start = time.perf_counter()
+        hybrid = {**HYBRID_SCORING, **(hybrid_weights or {})}
+        semantic = {**SEMANTIC_SCORING, **(semantic_weights or {})}
+
+        data = self.load_arrays()
+        data["semantic_score"] = combine_semantic(
+            data["resp_vs_projects"], data["skills_vs_resume"], semantic
+        )
+        scores = score_from_features(data, hybrid)
+
+        if write and len(scores):
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE pair_features SET overall_score = ?, updated_at = ? "
+                    "WHERE jd_id = ? AND resume_id = ?",
+                    zip(
+                        (int(s) for s in scores),
+                        [time.time()] * len(scores),
+                        data["jd_ids"],
+                        data["resume_ids"]
+                    )
+                )
+                self._conn.commit()
+
+        logger.info(f"Rescored {len(scores)} pairs in {time.perf_counter() - start:.2f}s")
+        return {
+            "jd_ids": data["jd_ids"],
+            "resume_ids": data["resume_ids"],
+            "overall_score": scores
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------
+# Shared instance used by the pipeline
+# ---------------------------------------------------------
+
+_STORE: Optional[FeatureStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_feature_store() -> Optional[FeatureStore]:
+    global _STORE
+
+    if not FEATURE_STORE_ENABLED:
+        return None
+
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = FeatureStore()
+    return _STORE
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or rescore stored pair features")
+    parser.add_argument("command", choices=["stats", "rescore"])
+    parser.add_argument("--weights", help="JSON file: {\"hybrid\": {...}, \"semantic\": {...}}")
+    parser.add_argument("--path", default=FEATURE_STORE_PATH)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    store = FeatureStore(args.path)
+
+    if args.command == "stats":
+        print(json.dumps({"pairs": len(store)}, indent=2))
+    else:
+        weights = {}
+        if args.weights:
+            with open(args.weights, "r", encoding="utf-8") as f:
+                weights = json.load(f)
+        result = store.rescore(weights.get("hybrid"), weights.get("semantic"), write=not args.dry_run)
+        scores = result["overall_score"]
+        if len(scores):
+            print(f"pairs={len(scores)} mean={scores.mean():.1f} min={scores.min()} max={scores.max()}")
@@ -14,9 +14,21 @@ Design goals:
 - Semantic similarity rescues good resumes
 - Evidence increases confidence
 - No single miss can nuke the score
+
+All weights come from config.settings.HYBRID_SCORING (or an explicit
+`weights` dict), so scores can be recomputed from stored pair
+features under a new config (see matching.feature_store).
+
+Optionally consumes a per-skill match table from
+matching.cascade_matcher, so phrasing variants of a JD skill
+(fuzzy / semantic matches) count towards coverage.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from config.settings import HYBRID_SCORING
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -33,43 +45,152 @@ def _normalize_list(xs: List[str]) -> List[str]:
 def _must_have_coverage(must_have: List[str], resume_pool: set) -> float:
     if not must_have:
         return 1.0
-    matched = sum(1 for s in must_have if s.lower() in resume_pool)
+    matched = sum(1 for s in must_have if s in resume_pool)
     return matched / len(must_have)
 
 
-def _nice_to_have_bonus(nice: List[str], resume_pool: set) -> float:
+def _nice_bonus_from_count(matched, weights: Optional[Dict[str, Any]] = None):
+    # works on ints and NumPy arrays
+    w = {**HYBRID_SCORING, **(weights or {})}
+    return np.minimum(w["nice_to_have_max_bonus"], matched * w["nice_to_have_step"])
+
+
+def _nice_matches(nice: List[str], resume_pool: set) -> int:
+    return sum(1 for s in nice if s in resume_pool)
+
+
+def _nice_to_have_bonus(nice: List[str], resume_pool: set, weights: Optional[Dict[str, Any]] = None) -> float:
     if not nice:
         return 0.0
-    matched = sum(1 for s in nice if s.lower() in resume_pool)
-    # max +15%
-    return min(0.15, matched * 0.05)
+    return float(_nice_bonus_from_count(_nice_matches(nice, resume_pool), weights))
+
+
+def _strong_evidence_count(skills_with_evidence: Dict[str, List[str]]) -> int:
+    return sum(1 for ev in (skills_with_evidence or {}).values() if len(ev) >= 2)
 
 
-def _evidence_multiplier(skills_with_evidence: Dict[str, List[str]]) -> float:
+def _evidence_boost(strong, weights: Optional[Dict[str, Any]] = None):
+    # works on ints and NumPy arrays
+    w = {**HYBRID_SCORING, **(weights or {})}
+    return np.where(
+        strong >= w["evidence_strong_min"], w["evidence_strong_boost"],
+        np.where(strong >= w["evidence_some_min"], w["evidence_some_boost"], 1.0)
+    )
+
+
+def _evidence_multiplier(skills_with_evidence: Dict[str, List[str]], weights: Optional[Dict[str, Any]] = None) -> float:
     """
     Boost score if multiple skills have strong evidence.
     """
     if not skills_with_evidence:
         return 1.0
+    return float(_evidence_boost(_strong_evidence_count(skills_with_evidence), weights))
 
-    strong = sum(1 for ev in skills_with_evidence.values() if len(ev) >= 2)
-    if strong >= 4:
-        return 1.12
-    if strong >= 2:
-        return 1.07
-    return 1.0
+
+def _compose_score(must_cov, semantic_score, nice_bonus, evidence_boost, weights: Optional[Dict[str, Any]] = None):
+    """
+    Final score composition. Accepts scalars or broadcastable NumPy
+    arrays, so single-pair and batch scoring share one formula.
+    """
+    w = {**HYBRID_SCORING, **(weights or {})}
+
+    # Semantic safety net
+    semantic_safe = np.maximum(semantic_score, w["semantic_floor"])
+
+    raw = (
+        w["must_have_weight"] * must_cov +
+        w["semantic_weight"] * semantic_safe +
+        w["base_floor"]          # baseline fairness
+    )
+
+    raw = (raw + nice_bonus) * evidence_boost
+
+    return np.clip(raw * 100, w["min_final_score"], 100).astype(np.int64)
+
+
+def score_from_features(features: Dict[str, Any], weights: Optional[Dict[str, Any]] = None):
+    """
+    Recomputes overall scores from stored pair features (scalars or
+    arrays) — no LLM, no embeddings. `features` needs:
+    must_cov, nice_matches, strong_evidence, semantic_score.
+    """
+    return _compose_score(
+        features["must_cov"],
+        features["semantic_score"],
+        _nice_bonus_from_count(np.asarray(features["nice_matches"]), weights),
+        _evidence_boost(np.asarray(features["strong_evidence"]), weights),
+        weights
+    )
 
 
 # ---------------------------------------------------------
 # MAIN SCORER
 # ---------------------------------------------------------
 
+def _matched_via_table(match_table: Optional[Dict[str, List[Dict[str, Any]]]]) -> Dict[str, Dict[str, Any]]:
+    """normalized JD skill → cascade entry, for every resolved skill."""
+    matched = {}
+    for entries in (match_table or {}).values():
+        for e in entries:
+            if e.get("method", "none") != "none":
+                matched[e["jd_skill"].lower().strip()] = e
+    return matched
+
+
+def _encode_pair(
+    jd_struct: Dict[str, Any],
+    resume_struct: Dict[str, Any],
+    match_table: Optional[Dict[str, List[Dict[str, Any]]]]
+) -> Dict[str, Any]:
+    # --- JD ---
+    must_have = _normalize_list(jd_struct.get("must_have_skills", []))
+    nice_to_have = _normalize_list(jd_struct.get("nice_to_have_skills", []))
+
+    # --- Resume ---
+    skills_with_evidence = resume_struct.get("skills_with_evidence", {})
+    resume_skills = _normalize_list(list(skills_with_evidence.keys()))
+    resume_tools = _normalize_list(resume_struct.get("tools", []))
+
+    # Cascade-resolved JD skills count as covered
+    table_matches = _matched_via_table(match_table)
+
+    return {
+        "must_have": must_have,
+        "nice_to_have": nice_to_have,
+        "skills_with_evidence": skills_with_evidence,
+        "table_matches": table_matches,
+        "resume_pool": set(resume_skills + resume_tools) | set(table_matches)
+    }
+
+
+def extract_pair_features(
+    jd_struct: Dict[str, Any],
+    resume_struct: Dict[str, Any],
+    match_table: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> Dict[str, Any]:
+    """
+    Weight-independent intermediate features of one JD/resume pair.
+    """
+    enc = _encode_pair(jd_struct, resume_struct, match_table)
+    return {
+        "must_cov": _must_have_coverage(enc["must_have"], enc["resume_pool"]),
+        "nice_matches": _nice_matches(enc["nice_to_have"], enc["resume_pool"]),
+        "strong_evidence": _strong_evidence_count(enc["skills_with_evidence"])
+    }
+
+
 def compute_hybrid_score(
     jd_struct: Dict[str, Any],
     resume_struct: Dict[str, Any],
-    semantic_score: float
+    semantic_score: float,
+    match_table: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    weights: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
+    match_table: optional output of cascade_matcher.match_jd_resume_skills.
+    When given, JD skills it resolved (exact/fuzzy/semantic) count as present.
+    weights: overrides config.settings.HYBRID_SCORING.
+
     Returns:
     {
       "overall_score": int,
@@ -78,37 +199,19 @@ def compute_hybrid_score(
       "suggestions": [...]
     }
     """
-
-    # --- JD ---
-    must_have = _normalize_list(jd_struct.get("must_have_skills", []))
-    nice_to_have = _normalize_list(jd_struct.get("nice_to_have_skills", []))
-
-    # --- Resume ---
-    skills_with_evidence = resume_struct.get("skills_with_evidence", {})
-    resume_skills = _normalize_list(list(skills_with_evidence.keys()))
-    resume_tools = _normalize_list(resume_struct.get("tools", []))
-
-    resume_pool = set(resume_skills + resume_tools)
+    enc = _encode_pair(jd_struct, resume_struct, match_table)
+    must_have = enc["must_have"]
+    skills_with_evidence = enc["skills_with_evidence"]
+    table_matches = enc["table_matches"]
+    resume_pool = enc["resume_pool"]
 
     # --- Core scores ---
     must_cov = _must_have_coverage(must_have, resume_pool)
-    nice_bonus = _nice_to_have_bonus(nice_to_have, resume_pool)
-    evidence_boost = _evidence_multiplier(skills_with_evidence)
-
-    # Semantic safety net
-    semantic_safe = max(semantic_score, 0.35)
+    nice_bonus = _nice_to_have_bonus(enc["nice_to_have"], resume_pool, weights)
+    evidence_boost = _evidence_multiplier(skills_with_evidence, weights)
 
     # --- Final score composition ---
-    raw = (
-        0.55 * must_cov +
-        0.30 * semantic_safe +
-        0.15          # baseline fairness
-    )
-
-    raw += nice_bonus
-    raw *= evidence_boost
-
-    final_score = int(max(35, min(100, raw * 100)))
+    final_score = int(_compose_score(must_cov, semantic_score, nice_bonus, evidence_boost, weights))
 
     # -------------------------------------------------
     # EXPLANATION (HR-readable)
@@ -119,7 +222,12 @@ def compute_hybrid_score(
     suggestions = []
 
     for s in must_have:
-        if s in resume_pool:
+        entry = table_matches.get(s)
+        if entry is not None and entry["method"] in ("fuzzy", "semantic"):
+            strengths.append(
+                f"Related evidence for required skill: {s} (matched '{entry['resume_skill']}')"
+            )
+        elif s in resume_pool:
             strengths.append(f"Strong evidence for required skill: {s}")
         else:
             gaps.append(s)
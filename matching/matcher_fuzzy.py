@@ -8,9 +8,19 @@ Used as a middle layer between EXACT matching
 and SEMANTIC (LLM-based) matching.
 
 Output: score between 0.0 → 1.0
+
+For JD × resume skill sets use the batch API (jaccard_matrix /
+best_fuzzy_matches): each skill is tokenized once and the full
+Jaccard matrix comes from one sparse matrix product.
 """
 
 import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
 from config.settings import STOPWORDS, debug_log
 from core.normalizer import clean_skill
 
@@ -18,12 +28,13 @@ from core.normalizer import clean_skill
 # ---------------------------------------------------------
 # Tokenizer
 # ---------------------------------------------------------
+@lru_cache(maxsize=50_000)
 def tokenize(text: str):
     """Convert text into normalized tokens."""
     cleaned = clean_skill(text)
     tokens = re.split(r"[ \-/_,]+", cleaned)
 
-    return set(t for t in tokens if t and t not in STOPWORDS)
+    return frozenset(t for t in tokens if t and t not in STOPWORDS)
 
 
 # ---------------------------------------------------------
@@ -57,6 +68,73 @@ def fuzzy_match_skill(skill_from_jd: str, skill_from_resume: str) -> float:
     return score
 
 
+# ---------------------------------------------------------
+# Batch API (JD skills × resume skills)
+# ---------------------------------------------------------
+def _token_ids(skills: List[str], vocab: Dict[str, int]) -> List[List[int]]:
+    """Tokenizes each skill once and maps tokens to integer IDs (grows vocab)."""
+    return [
+        [vocab.setdefault(token, len(vocab)) for token in tokenize(skill)]
+        for skill in skills
+    ]
+
+
+def _incidence_matrix(rows: List[List[int]], n_tokens: int) -> sparse.csr_matrix:
+    """Binary (len(rows) × n_tokens) token incidence matrix."""
+    indptr = np.cumsum([0] + [len(r) for r in rows])
+    indices = np.fromiter((t for r in rows for t in r), dtype=np.int64, count=int(indptr[-1]))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_tokens))
+
+
+def jaccard_matrix(jd_skills: List[str], resume_skills: List[str]) -> np.ndarray:
+    """
+    Full token-Jaccard matrix, shape (len(jd_skills), len(resume_skills)).
+    |A ∩ B| = A · Bᵀ on binary incidence rows; |A ∪ B| = |A| + |B| − |A ∩ B|.
+    """
+    if not jd_skills or not resume_skills:
+        return np.zeros((len(jd_skills), len(resume_skills)), dtype=np.float32)
+
+    vocab: Dict[str, int] = {}
+    jd_rows = _token_ids(jd_skills, vocab)
+    resume_rows = _token_ids(resume_skills, vocab)
+
+    n_tokens = max(len(vocab), 1)
+    A = _incidence_matrix(jd_rows, n_tokens)
+    B = _incidence_matrix(resume_rows, n_tokens)
+
+    inter = (A @ B.T).toarray()
+    size_a = np.array([len(r) for r in jd_rows], dtype=np.float32)
+    size_b = np.array([len(r) for r in resume_rows], dtype=np.float32)
+    union = size_a[:, None] + size_b[None, :] - inter
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(union > 0, inter / union, 0.0)
+    return scores.astype(np.float32)
+
+
+def best_fuzzy_matches(
+    jd_skills: List[str],
+    resume_skills: List[str]
+) -> List[Tuple[str, Optional[str], float]]:
+    """
+    For each JD skill → (jd_skill, best resume skill or None, jaccard score).
+    """
+    scores = jaccard_matrix(jd_skills, resume_skills)
+    if scores.shape[1] == 0:
+        return [(s, None, 0.0) for s in jd_skills]
+
+    best_idx = scores.argmax(axis=1)
+    best_score = scores[np.arange(len(jd_skills)), best_idx]
+
+    results = []
+    for skill, j, score in zip(jd_skills, best_idx, best_score):
+        results.append((skill, resume_skills[j] if score > 0 else None, float(score)))
+
+    debug_log(f"[FUZZY] batch matched {len(jd_skills)} × {len(resume_skills)} skills")
+    return results
+
+
 # ---------------------------------------------------------
 # Alias function used by hybrid_scorer
 # ---------------------------------------------------------
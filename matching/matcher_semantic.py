@@ -10,59 +10,119 @@ Outputs a semantic similarity score in [0, 1] between:
 
 from __future__ import annotations
 
-from typing import List, Dict, Any
-import math
+from typing import List, Dict, Any, Optional
+import threading
 
+import numpy as np
+
+from config.settings import SEMANTIC_MODEL_NAME, EMBEDDING_BATCH_SIZE, SEMANTIC_SCORING
+from matching.embedding_cache import get_embedding_cache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 _MODEL = None
+_MODEL_LOCK = threading.Lock()
 
 
 # ---------------------------------------------------------
 # Lazy load sentence transformer
 # ---------------------------------------------------------
-def _lazy_load_model(model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+def _lazy_load_model(model_name: str = SEMANTIC_MODEL_NAME):
     global _MODEL
-    if _MODEL is None:
-        from sentence_transformers import SentenceTransformer
-        _MODEL = SentenceTransformer(model_name)
-        logger.info(f"Loaded semantic model: {model_name}")
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            from sentence_transformers import SentenceTransformer
+            _MODEL = SentenceTransformer(model_name)
+            logger.info(f"Loaded semantic model: {model_name}")
     return _MODEL
 
 
-# ---------------------------------------------------------
-# Cosine similarity (no numpy dependency)
-# ---------------------------------------------------------
-def _cosine(a: List[float], b: List[float]) -> float:
-    dot = 0.0
-    na = 0.0
-    nb = 0.0
-    for x, y in zip(a, b):
-        dot += x * y
-        na += x * x
-        nb += y * y
-    if na == 0.0 or nb == 0.0:
-        return 0.0
-    return dot / (math.sqrt(na) * math.sqrt(nb))
+def warm_up_model() -> None:
+    """
+    Loads the embedding model ahead of time (e.g. in parallel
+    with LLM stages) so the first match doesn't pay for it.
+    """
+    _lazy_load_model()
 
 
 # ---------------------------------------------------------
 # Embedding helper
 # ---------------------------------------------------------
-def _embed_texts(texts: List[str]) -> List[List[float]]:
-    if not texts:
-        return []
-
+def _encode(texts: List[str], batch_size: int) -> np.ndarray:
     model = _lazy_load_model()
 
-    # IMPORTANT: returns List[List[float]]
-    return model.encode(
+    emb = model.encode(
         texts,
+        batch_size=batch_size,
         normalize_embeddings=True,
         convert_to_numpy=True
-    ).tolist()
+    )
+    return np.asarray(emb, dtype=np.float32)
+
+
+def _embed_texts(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """
+    Returns a float32 array of shape (len(texts), dim).
+    Rows are L2-normalized, so dot product == cosine similarity.
+    Previously seen texts come from the embedding cache; only
+    the rest go through the encoder.
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    cache = get_embedding_cache(SEMANTIC_MODEL_NAME)
+    if cache is None:
+        return _encode(texts, batch_size)
+
+    found, missing = cache.get_many(texts)
+
+    if missing:
+        fresh = _encode(missing, batch_size)
+        cache.put_many(missing, fresh)
+        found.update(zip(missing, fresh))
+        found_again, _ = cache.get_many([t for t in texts if t not in found])
+        found.update(found_again)
+
+    return np.stack([found[t] for t in texts]).astype(np.float32, copy=False)
+
+
+def _embed_groups(groups: List[List[str]], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[np.ndarray]:
+    """
+    Embeds several text groups with ONE encoder call.
+    Texts are deduplicated across all groups, encoded once,
+    and the result is sliced back into one array per group.
+    """
+    index: Dict[str, int] = {}
+    for group in groups:
+        for text in group:
+            index.setdefault(text, len(index))
+
+    if not index:
+        return [np.zeros((0, 0), dtype=np.float32) for _ in groups]
+
+    emb = _embed_texts(list(index), batch_size=batch_size)
+    return [emb[[index[t] for t in group]] for group in groups]
+
+
+# ---------------------------------------------------------
+# Similarity matrix
+# ---------------------------------------------------------
+def _cosine_matrix(embA: np.ndarray, embB: np.ndarray) -> np.ndarray:
+    # Embeddings are unit-norm → one matmul gives every cosine
+    return embA @ embB.T
+
+
+def similarity_matrix(A: List[str], B: List[str]) -> np.ndarray:
+    """
+    Full cosine similarity matrix, shape (len(A), len(B)).
+    sim[i, j] is the similarity between A[i] and B[j].
+    """
+    if not A or not B:
+        return np.zeros((len(A), len(B)), dtype=np.float32)
+
+    embA, embB = _embed_groups([A, B])
+    return _cosine_matrix(embA, embB)
 
 
 # ---------------------------------------------------------
@@ -85,27 +145,43 @@ def _flatten_resume_evidence(skills_with_evidence: Dict[str, List[str]]) -> List
 # ---------------------------------------------------------
 # Pairwise similarity
 # ---------------------------------------------------------
-def _pairwise_max_similarity(A: List[str], B: List[str]) -> float:
-    if not A or not B:
+def _max_similarity(embA: np.ndarray, embB: np.ndarray) -> float:
+    if embA.shape[0] == 0 or embB.shape[0] == 0:
         return 0.0
 
-    embA = _embed_texts(A)
-    embB = _embed_texts(B)
+    best = float(_cosine_matrix(embA, embB).max())
+    return max(0.0, min(1.0, best))
 
-    best = 0.0
-    for va in embA:
-        for vb in embB:
-            s = _cosine(va, vb)
-            if s > best:
-                best = s
 
-    return max(0.0, min(1.0, best))
+def _pairwise_max_similarity(A: List[str], B: List[str]) -> float:
+    if not A or not B:
+        return 0.0
+
+    embA, embB = _embed_groups([A, B])
+    return _max_similarity(embA, embB)
 
 
 # ---------------------------------------------------------
 # Public API
 # ---------------------------------------------------------
-def semantic_match_structured(jd_struct: Dict[str, Any], resume_struct: Dict[str, Any]) -> float:
+def combine_semantic(resp_vs_projects, skills_vs_resume, weights: Dict[str, float] = None):
+    """Blends the two similarity signals (scalars or NumPy arrays)."""
+    w = {**SEMANTIC_SCORING, **(weights or {})}
+    score = w["responsibilities_weight"] * resp_vs_projects + w["skills_weight"] * skills_vs_resume
+    return np.clip(score, 0.0, 1.0)
+
+
+def semantic_match_components(
+    jd_struct: Dict[str, Any],
+    resume_struct: Dict[str, Any],
+    skills_vs_resume: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    {"resp_vs_projects": float, "skills_vs_resume": float, "semantic_score": float}
+
+    skills_vs_resume: precomputed skill similarity (e.g.
+    cascade_matcher.skill_similarity); when given, skills are not embedded.
+    """
     jd_responsibilities = jd_struct.get("responsibilities", []) or []
     jd_must = jd_struct.get("must_have_skills", []) or []
     jd_nice = jd_struct.get("nice_to_have_skills", []) or []
@@ -116,18 +192,18 @@ def semantic_match_structured(jd_struct: Dict[str, Any], resume_struct: Dict[str
 
     resume_evidence_chunks = _flatten_resume_evidence(resume_evidence_map)
 
-    resp_vs_projects = _pairwise_max_similarity(
-        jd_responsibilities,
-        resume_projects + resume_evidence_chunks
-    )
+    groups = [jd_responsibilities, resume_projects + resume_evidence_chunks]
+    if skills_vs_resume is None:
+        groups += [jd_must + jd_nice, list(resume_evidence_map.keys()) + resume_tools]
 
-    skills_vs_resume = _pairwise_max_similarity(
-        jd_must + jd_nice,
-        list(resume_evidence_map.keys()) + resume_tools
-    )
+    # One deduplicated encoder pass for every text in this match
+    embedded = _embed_groups(groups)
+
+    resp_vs_projects = _max_similarity(embedded[0], embedded[1])
+    if skills_vs_resume is None:
+        skills_vs_resume = _max_similarity(embedded[2], embedded[3])
 
-    semantic_score = 0.65 * resp_vs_projects + 0.35 * skills_vs_resume
-    semantic_score = max(0.0, min(1.0, semantic_score))
+    semantic_score = float(combine_semantic(resp_vs_projects, skills_vs_resume))
 
     logger.info(
         f"Semantic score: {semantic_score:.3f} | "
@@ -135,4 +211,12 @@ def semantic_match_structured(jd_struct: Dict[str, Any], resume_struct: Dict[str
         f"skills_vs_resume={skills_vs_resume:.3f}"
     )
 
-    return semantic_score
+    return {
+        "resp_vs_projects": resp_vs_projects,
+        "skills_vs_resume": skills_vs_resume,
+        "semantic_score": semantic_score
+    }
+
+
+def semantic_match_structured(jd_struct: Dict[str, Any], resume_struct: Dict[str, Any]) -> float:
+    return semantic_match_components(jd_struct, resume_struct)["semantic_score"]
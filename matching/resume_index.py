@@ -0,0 +1,287 @@
+"""
+matching/resume_index.py
+------------------------
+Approximate nearest-neighbour index over analyzed resumes.
+
+Each resume is represented by ONE pooled vector: the normalized mean
+of its project + evidence embeddings (falls back to skills/tools).
+Vectors live in a NumPy-backed IVF index (spherical k-means coarse
+quantizer + inverted lists), so a JD is compared against only the
+`n_probe` closest clusters instead of the whole pool.
+
+Typical flow:
+    index = ResumeIndex()
+    index.add_many(analyzed_resumes.items())
+    index.build()
+    shortlist = index.top_k(jd_struct, k=200)
+    ranked = rank_candidates(jd_struct, analyzed_resumes, k=50, index=index)
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from config.settings import RESUME_INDEX
+from matching.matcher_semantic import _embed_groups, _flatten_resume_evidence, semantic_match_structured
+from matching.hybrid_scorer import compute_hybrid_score
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ---------------------------------------------------------
+# Pooled document vectors
+# ---------------------------------------------------------
+
+def _resume_texts(resume_struct: Dict[str, Any]) -> List[str]:
+    evidence_map = resume_struct.get("skills_with_evidence", {}) or {}
+    texts = (resume_struct.get("projects", []) or []) + _flatten_resume_evidence(evidence_map)
+    if not texts:
+        texts = list(evidence_map.keys()) + (resume_struct.get("tools", []) or [])
+    return [t for t in texts if isinstance(t, str) and t.strip()]
+
+
+def _jd_texts(jd_struct: Dict[str, Any]) -> List[str]:
+    texts = (
+        (jd_struct.get("responsibilities", []) or []) +
+        (jd_struct.get("must_have_skills", []) or []) +
+        (jd_struct.get("nice_to_have_skills", []) or [])
+    )
+    return [t for t in texts if isinstance(t, str) and t.strip()]
+
+
+def _pool(emb: np.ndarray) -> Optional[np.ndarray]:
+    if emb.shape[0] == 0:
+        return None
+    v = emb.mean(axis=0)
+    norm = np.linalg.norm(v)
+    return (v / norm).astype(np.float32) if norm > 0 else None
+
+
+def pooled_vectors(text_groups: List[List[str]]) -> List[Optional[np.ndarray]]:
+    """One encoder pass for many documents → one unit vector (or None) per document."""
+    return [_pool(emb) for emb in _embed_groups(text_groups)]
+
+
+def pooled_jd_vector(jd_struct: Dict[str, Any]) -> Optional[np.ndarray]:
+    return pooled_vectors([_jd_texts(jd_struct)])[0]
+
+
+# ---------------------------------------------------------
+# IVF index
+# ---------------------------------------------------------
+
+class ResumeIndex:
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = RESUME_INDEX["n_lists"],
+        n_probe: int = RESUME_INDEX["n_probe"]
+    ):
+        self.n_lists = n_lists     # None → ~sqrt(N) at build time
+        self.n_probe = n_probe
+
+        self.ids: List[str] = []
+        self._rows: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+        self.centroids: Optional[np.ndarray] = None
+        self._assign: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ---------------------------------------------------------
+    # Adding documents
+    # ---------------------------------------------------------
+
+    def add_vectors(self, ids: List[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.ids.extend(ids)
+        self._rows.extend(vectors)
+        self._matrix = None
+
+        if self.centroids is not None:
+            new_assign = np.argmax(vectors @ self.centroids.T, axis=1)
+            self._assign = np.concatenate([self._assign, new_assign])
+            self._order = None
+
+    def add_many(self, items: Iterable[Tuple[str, Dict[str, Any]]], batch_size: int = 256) -> int:
+        """
+        Adds (resume_id, resume_struct) pairs, embedding `batch_size`
+        resumes per encoder call. Resumes with no usable text are skipped.
+        """
+        added = 0
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+
+        def _flush():
+            nonlocal added
+            vectors = pooled_vectors([_resume_texts(s) for _, s in batch])
+            keep = [(rid, v) for (rid, _), v in zip(batch, vectors) if v is not None]
+            if keep:
+                self.add_vectors([rid for rid, _ in keep], np.stack([v for _, v in keep]))
+                added += len(keep)
+            batch.clear()
+
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                _flush()
+        if batch:
+            _flush()
+
+        logger.info(f"Indexed {added} resumes (total={len(self)})")
+        return added
+
+    def add(self, resume_id: str, resume_struct: Dict[str, Any]) -> bool:
+        return self.add_many([(resume_id, resume_struct)]) == 1
+
+    def vectors(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = (
+                np.stack(self._rows).astype(np.float32, copy=False)
+                if self._rows else np.zeros((0, 0), dtype=np.float32)
+            )
+        return self._matrix
+
+    # ---------------------------------------------------------
+    # Training (spherical k-means)
+    # ---------------------------------------------------------
+
+    def build(self, n_iter: int = 20, sample_size: int = 100_000, seed: int = 0) -> None:
+        X = self.vectors()
+        n = X.shape[0]
+        if n == 0:
+            return
+
+        n_lists = self.n_lists or int(np.sqrt(n))
+        n_lists = max(1, min(n_lists, n))
+
+        rng = np.random.default_rng(seed)
+        train = X if n <= sample_size else X[rng.choice(n, sample_size, replace=False)]
+        C = train[rng.choice(train.shape[0], n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            labels = np.argmax(train @ C.T, axis=1)
+            sums = np.zeros_like(C)
+            np.add.at(sums, labels, train)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            C = np.where(empty[:, None], C, sums / np.maximum(norms, 1e-12))
+
+        self.centroids = C.astype(np.float32)
+        self._assign = np.argmax(X @ self.centroids.T, axis=1)
+        self._order = None
+        logger.info(f"Built IVF index: {n} resumes, {n_lists} lists")
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._order is None:
+            self._order = np.argsort(self._assign, kind="stable")
+            counts = np.bincount(self._assign, minlength=self.centroids.shape[0])
+            self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self._order, self._offsets
+
+    # ---------------------------------------------------------
+    # Search
+    # ---------------------------------------------------------
+
+    def search(self, query: np.ndarray, k: int, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        X = self.vectors()
+        if X.shape[0] == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+
+        if self.centroids is None:
+            candidates = np.arange(X.shape[0])          # not built → exact scan
+        else:
+            n_probe = min(n_probe or self.n_probe, self.centroids.shape[0])
+            probe = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+            order, offsets = self._inverted_lists()
+            candidates = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probe])
+
+        scores = X[candidates] @ query
+        k = min(k, scores.shape[0])
+        if k == 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[candidates[i]], float(scores[i])) for i in top]
+
+    def top_k(self, jd_struct: Dict[str, Any], k: int = 100, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        query = pooled_jd_vector(jd_struct)
+        if query is None:
+            return []
+        return self.search(query, k, n_probe)
+
+    # ---------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        arrays = {
+            "ids": np.array(self.ids, dtype=object),
+            "vectors": self.vectors(),
+            "n_probe": np.array(self.n_probe)
+        }
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+            arrays["assign"] = self._assign
+        # A file handle keeps np.savez from appending ".npz", so load(path) finds it
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ResumeIndex":
+        with open(path, "rb") as f:
+            data = dict(np.load(f, allow_pickle=True))
+        index = cls(n_lists=None, n_probe=int(data["n_probe"]))
+        index.ids = list(data["ids"])
+        index._matrix = data["vectors"].astype(np.float32, copy=False)
+        index._rows = list(index._matrix)
+        if "centroids" in data:
+            index.centroids = data["centroids"]
+            index._assign = data["assign"]
+        return index
+
+
+# ---------------------------------------------------------
+# Shortlist → full hybrid scoring
+# ---------------------------------------------------------
+
+def rank_candidates(
+    jd_struct: Dict[str, Any],
+    resumes: Mapping[str, Dict[str, Any]],
+    k: int = 50,
+    index: Optional[ResumeIndex] = None,
+    shortlist_size: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Retrieves a shortlist from the ANN index and runs the full
+    semantic + hybrid scorer only on it. Returns the best `k`
+    results sorted by overall_score.
+    """
+    if index is None:
+        index = ResumeIndex()
+        index.add_many(resumes.items())
+        index.build()
+
+    shortlist = index.top_k(jd_struct, k=shortlist_size or k * RESUME_INDEX["shortlist_factor"])
+
+    ranked = []
+    for resume_id, ann_score in shortlist:
+        resume_struct = resumes[resume_id]
+        semantic_score = semantic_match_structured(jd_struct, resume_struct)
+        result = compute_hybrid_score(jd_struct, resume_struct, semantic_score)
+        ranked.append({
+            "resume_id": resume_id,
+            "ann_score": round(ann_score, 3),
+            "semantic_score": round(float(semantic_score), 3),
+            **result
+        })
+
+    ranked.sort(key=lambda r: r["overall_score"], reverse=True)
+    return ranked[:k]
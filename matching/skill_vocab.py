@@ -0,0 +1,187 @@
+"""
+matching/skill_vocab.py
+-----------------------
+Interned skill vocabulary + bitset skill pools for batch scoring.
+
+Every distinct (lowercased, stripped) resume skill string of a batch
+gets an integer ID, and each resume becomes a packed NumPy uint8 row
+(np.packbits). A JD is scored against all rows with one vectorized
+AND + popcount.
+
+A vocabulary belongs to one batch (one ResumeBitsetPool), so it is
+bounded by that batch's resume skills and dropped with it. JD skills
+are only looked up, never interned: a skill no resume has cannot match.
+Only the bytes that are non-zero in the JD mask are touched, so the
+cost per JD is O(N resumes × JD skills).
+
+Single-pair scoring (hybrid_scorer) keeps plain set membership.
+"""
+
+import json
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+def skill_key(skill: str) -> str:
+    # Same normalization hybrid_scorer has always applied
+    return skill.lower().strip()
+
+
+# ---------------------------------------------------------
+# Vocabulary
+# ---------------------------------------------------------
+
+class SkillVocabulary:
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._skills: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def intern(self, skill: str) -> int:
+        key = skill_key(skill)
+        sid = self._ids.get(key)
+        if sid is not None:
+            return sid
+        with self._lock:
+            sid = self._ids.get(key)
+            if sid is None:
+                sid = len(self._skills)
+                self._ids[key] = sid
+                self._skills.append(key)
+        return sid
+
+    def intern_many(self, skills: Iterable[str]) -> List[int]:
+        return [self.intern(s) for s in skills if isinstance(s, str) and s.strip()]
+
+    def lookup(self, skill: str) -> Optional[int]:
+        return self._ids.get(skill_key(skill))
+
+    def skill(self, sid: int) -> str:
+        return self._skills[sid]
+
+    # ---------------------------------------------------------
+    # Bitset encodings
+    # ---------------------------------------------------------
+
+    def mask(self, skills: Iterable[str], width: Optional[int] = None) -> np.ndarray:
+        """Boolean mask of length `width` (defaults to current vocabulary size)."""
+        ids = self.intern_many(skills)
+        m = np.zeros(max(width or len(self), len(self)), dtype=bool)
+        m[ids] = True
+        return m
+
+    def packed(self, skills: Iterable[str], n_bytes: Optional[int] = None) -> np.ndarray:
+        """np.packbits of the mask, zero-padded to `n_bytes`."""
+        p = np.packbits(self.mask(skills))
+        if n_bytes is not None and p.shape[0] < n_bytes:
+            p = np.pad(p, (0, n_bytes - p.shape[0]))
+        return p
+
+    # ---------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self._skills, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillVocabulary":
+        vocab = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            for skill in json.load(f):
+                vocab.intern(skill)
+        return vocab
+
+
+# ---------------------------------------------------------
+# Popcount helpers
+# ---------------------------------------------------------
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(packed: np.ndarray) -> np.ndarray:
+    """Set bits per row of a packed uint8 matrix."""
+    return _POPCOUNT_TABLE[packed].sum(axis=-1, dtype=np.int64)
+
+
+def resume_skills(resume_struct: Dict[str, Any]) -> List[str]:
+    """Skill pool of an analyzed resume: evidence-backed skills + tools."""
+    skills = list((resume_struct.get("skills_with_evidence", {}) or {}).keys())
+    return [s for s in skills + (resume_struct.get("tools", []) or []) if isinstance(s, str)]
+
+
+# ---------------------------------------------------------
+# Bitset pool over many resumes
+# ---------------------------------------------------------
+
+class ResumeBitsetPool:
+    """
+    N resumes × vocabulary, stored as packed bit rows.
+    Rows grow in width as the vocabulary grows. Each pool gets its own
+    vocabulary unless one is passed in.
+    """
+
+    def __init__(self, vocab: Optional[SkillVocabulary] = None):
+        self.vocab = vocab if vocab is not None else SkillVocabulary()
+        self.ids: List[str] = []
+        self._rows: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, resume_id: str, resume_struct: Dict[str, Any]) -> None:
+        self.add_skills(resume_id, resume_skills(resume_struct))
+
+    def add_skills(self, resume_id: str, skills: Iterable[str]) -> None:
+        self.ids.append(resume_id)
+        self._rows.append(self.vocab.packed(skills))
+        self._matrix = None
+
+    def matrix(self) -> np.ndarray:
+        """(N, n_bytes) uint8 packed bitsets, padded to the widest row."""
+        if self._matrix is None:
+            n_bytes = max((r.shape[0] for r in self._rows), default=0)
+            m = np.zeros((len(self._rows), n_bytes), dtype=np.uint8)
+            for i, r in enumerate(self._rows):
+                m[i, :r.shape[0]] = r
+            self._matrix = m
+        return self._matrix
+
+    def match_counts(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        For a JD skill list → (N,) number of those skills present in each
+        resume pool: popcount(pool AND jd), over the JD's non-zero bytes only.
+        A skill listed k times (after skill_key) counts k times, like the
+        single-pair scorer: one bitset pass per distinct multiplicity.
+        Unknown skills match nothing.
+        """
+        pool = self.matrix()
+        width = pool.shape[1] * 8
+        ids = [
+            sid for sid in (self.vocab.lookup(s) for s in skills if isinstance(s, str))
+            if sid is not None and sid < width
+        ]
+
+        by_multiplicity: Dict[int, List[int]] = defaultdict(list)
+        for sid, k in Counter(ids).items():
+            by_multiplicity[k].append(sid)
+
+        counts = np.zeros(len(self), dtype=np.int64)
+        for k, group in by_multiplicity.items():
+            mask = np.zeros(width, dtype=bool)
+            mask[group] = True
+            jd = np.packbits(mask)
+
+            cols = np.flatnonzero(jd)
+            counts += k * popcount_rows(pool[:, cols] & jd[cols])
+        return counts
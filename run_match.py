@@ -9,16 +9,24 @@ End-to-end execution using:
 - LLM JD analyzer
 - Semantic matcher (embeddings)
 - Human-aligned hybrid scorer
+
+Stages run as a dependency graph: the resume branch, the JD branch
+and the embedding model load execute concurrently.
+
+Heavy dependencies (Gemini SDK, PyMuPDF, NumPy, sentence-transformers)
+are imported only when the stage that needs them runs, so importing
+this module stays cheap. See benchmarks/import_time.py.
 """
 
+import hashlib
 import json
+from typing import Optional
 from utils.logger import get_logger
+from utils.stage_graph import StageGraph
 
 from core.resume_parser import parse_resume   # PDF → dict
 from core.resume_analyzer import analyze_resume
 from core.jd_analyzer import analyze_jd
-from matching.matcher_semantic import semantic_match_structured
-from matching.hybrid_scorer import compute_hybrid_score
 
 logger = get_logger(__name__)
 
@@ -30,13 +38,10 @@ JD_PATH = "data/samples/sample_jd.txt"
 
 
 # -----------------------------------------------
-# Main Pipeline
+# Stage functions
 # -----------------------------------------------
-def run_pipeline():
-    logger.info("🚀 Starting MatchMyJD pipeline...")
-
-    # --- Resume ---
-    resume_data = parse_resume(RESUME_PATH)
+def _extract_resume_text(resume_path: str) -> str:
+    resume_data = parse_resume(resume_path)
 
     # ✅ FIX: parser returns "raw_text", not "text"
     if isinstance(resume_data, dict):
@@ -47,22 +52,102 @@ def run_pipeline():
     if not isinstance(resume_text, str) or not resume_text.strip():
         raise ValueError("❌ Failed to extract resume text")
 
-    resume_struct = analyze_resume(resume_text)
+    return resume_text
+
+
+def _read_jd(jd_path: str) -> str:
+    with open(jd_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _resume_artifact(resume_path: str) -> dict:
+    """Parsed + analyzed resume, short-circuited when the PDF was seen before."""
+    from core.dedupe import get_dedupe_ingestor
+
+    ingestor = get_dedupe_ingestor()
+    if ingestor is None:
+        resume_text = _extract_resume_text(resume_path)
+        return {"parsed": {"raw_text": resume_text}, "analysis": analyze_resume(resume_text)}
+
+    # Raises before analysis when no text could be extracted
+    return ingestor.ingest_resume(resume_path)
+
+
+def _jd_artifact(jd_text: str, company: Optional[str] = None) -> dict:
+    """
+    Analyzed JD, short-circuited when the same (cleaned) JD was seen before.
+    `company` selects the per-company boilerplate statistics.
+    """
+    from core.dedupe import get_dedupe_ingestor
+
+    ingestor = get_dedupe_ingestor()
+    if ingestor is None:
+        from core.jd_near_dup import get_near_dup_index
+        return {"analysis": analyze_jd(jd_text, near_dup_index=get_near_dup_index(), company=company)}
+    return ingestor.ingest_jd(jd_text, company=company)
+
+
+def _warm_up_embeddings() -> None:
+    from matching.matcher_semantic import warm_up_model
+    warm_up_model()
+
+
+def _semantic(jd_struct: dict, resume_struct: dict, skill_matches: dict, embedding_model=None) -> dict:
+    from matching.cascade_matcher import skill_similarity
+    from matching.matcher_semantic import semantic_match_components
+
+    # Skill similarity comes from the cascade: only its residue was embedded
+    return semantic_match_components(
+        jd_struct, resume_struct, skills_vs_resume=skill_similarity(skill_matches)
+    )
+
+
+def _skill_matches(jd_struct: dict, resume_struct: dict, embedding_model=None) -> dict:
+    from matching.cascade_matcher import match_jd_resume_skills
+    return match_jd_resume_skills(jd_struct, resume_struct)
+
+
+def _content_id(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
 
-    # --- JD ---
-    with open(JD_PATH, "r", encoding="utf-8") as f:
-        jd_text = f.read()
 
-    jd_struct = analyze_jd(jd_text)
+def _record_features(jd_text, resume_text, jd_struct, resume_struct, semantic, skill_matches, overall_score):
+    from matching.feature_store import get_feature_store
+    from matching.hybrid_scorer import extract_pair_features
 
-    # --- Semantic Matching ---
-    semantic_score = semantic_match_structured(jd_struct, resume_struct)
+    store = get_feature_store()
+    if store is None:
+        return
+
+    features = extract_pair_features(jd_struct, resume_struct, match_table=skill_matches)
+    features["resp_vs_projects"] = semantic["resp_vs_projects"]
+    features["skills_vs_resume"] = semantic["skills_vs_resume"]
+    store.put(_content_id(jd_text), _content_id(resume_text), features, overall_score)
+
+
+def _score(
+    jd_text: str,
+    resume_text: str,
+    jd_struct: dict,
+    resume_struct: dict,
+    semantic: dict,
+    skill_matches: dict
+) -> dict:
+    from matching.hybrid_scorer import compute_hybrid_score
+
+    semantic_score = semantic["semantic_score"]
 
-    # --- Hybrid Scoring ---
     final_result = compute_hybrid_score(
         jd_struct=jd_struct,
         resume_struct=resume_struct,
-        semantic_score=semantic_score
+        semantic_score=semantic_score,
+        match_table=skill_matches
+    )
+
+    # Persist weight-independent features for cheap rescoring later
+    _record_features(
+        jd_text, resume_text, jd_struct, resume_struct,
+        semantic, skill_matches, final_result["overall_score"]
     )
 
     return {
@@ -71,6 +156,69 @@ def run_pipeline():
     }
 
 
+# -----------------------------------------------
+# Stage graph
+# -----------------------------------------------
+def build_match_graph() -> StageGraph:
+    """
+    Inputs: resume_path, jd_path, company (may be None)
+    Output stage: "result"
+
+        resume_path → resume_artifact → resume_text / resume_struct ─┐
+        jd_path     → jd_text → jd_artifact → jd_struct             ─┼→ skill_matches → semantic → result
+        embedding_model ─────────────────────────────────────────────┘
+
+    The *_artifact stages go through core.dedupe, so a re-uploaded PDF or
+    re-pasted JD skips parsing / LLM analysis entirely.
+    """
+    graph = StageGraph()
+
+    # --- Resume branch ---
+    graph.add("resume_artifact", _resume_artifact, deps=["resume_path"])
+    graph.add("resume_text", lambda resume_artifact: resume_artifact["parsed"]["raw_text"], deps=["resume_artifact"])
+    graph.add("resume_struct", lambda resume_artifact: resume_artifact["analysis"], deps=["resume_artifact"])
+
+    # --- JD branch ---
+    graph.add("jd_text", _read_jd, deps=["jd_path"])
+    graph.add("jd_artifact", _jd_artifact, deps=["jd_text", "company"])
+    graph.add("jd_struct", lambda jd_artifact: jd_artifact["analysis"], deps=["jd_artifact"])
+
+    # --- Embedding model warm-up (overlaps with LLM calls) ---
+    graph.add("embedding_model", _warm_up_embeddings)
+
+    # --- Matching ---
+    graph.add("skill_matches", _skill_matches, deps=["jd_struct", "resume_struct", "embedding_model"])
+    graph.add("semantic", _semantic, deps=["jd_struct", "resume_struct", "skill_matches", "embedding_model"])
+    graph.add(
+        "result",
+        _score,
+        deps=["jd_text", "resume_text", "jd_struct", "resume_struct", "semantic", "skill_matches"]
+    )
+
+    return graph
+
+
+# -----------------------------------------------
+# Main Pipeline
+# -----------------------------------------------
+def run_pipeline(resume_path: str = RESUME_PATH, jd_path: str = JD_PATH, company: Optional[str] = None):
+    logger.info("🚀 Starting MatchMyJD pipeline...")
+
+    results = build_match_graph().run(
+        inputs={"resume_path": resume_path, "jd_path": jd_path, "company": company}
+    )
+
+    from core.dedupe import get_dedupe_ingestor
+    ingestor = get_dedupe_ingestor()
+    if ingestor is not None:
+        ingestor.log_stats()
+
+    from utils.metrics import log_metrics
+    log_metrics()
+
+    return results["result"]
+
+
 # -----------------------------------------------
 # CLI Entry
 # -----------------------------------------------
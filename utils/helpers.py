@@ -16,3 +16,8 @@ def split_resume_into_sections(text: str) -> dict:
             sections[current].append(line)
 
     return {k: "\n".join(v) for k, v in sections.items()}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return max(1, len(text or "") // 4)
@@ -6,16 +6,24 @@ Robust JSON extractor for LLM outputs.
 Handles:
 - ```json fences
 - Trailing text
-- Missing closing braces
-- Partial truncation (best-effort recovery)
+- Missing closing braces / partial truncation (structural repair via
+  utils/json_stream.py; extract_json_with_status reports it)
 """
 
 import json
 import re
+from typing import Tuple
+
 from config.settings import debug_log
+from utils.json_stream import IncrementalJSONParser
 
 
-def extract_json_from_text(text: str) -> dict:
+def extract_json_with_status(text: str) -> Tuple[dict, bool]:
+    """
+    Returns (parsed, repaired). repaired=True means the object never
+    closed (truncated reply) and was cut back to its last complete
+    element: usable, but not worth caching.
+    """
     if not text or not isinstance(text, str):
         raise ValueError("Empty or invalid LLM response")
 
@@ -29,25 +37,31 @@ def extract_json_from_text(text: str) -> dict:
     if start == -1:
         raise ValueError("No JSON object start found")
 
-    if end == -1:
-        debug_log("⚠️ Missing closing brace, attempting recovery")
-        cleaned = cleaned + "}"
-
-    json_str = cleaned[start:end + 1]
+    json_str = cleaned[start:end + 1] if end > start else ""
 
-    # 3️⃣ Balance braces if truncated
-    open_braces = json_str.count("{")
-    close_braces = json_str.count("}")
+    # 3️⃣ Parse attempt
+    if json_str:
+        try:
+            return json.loads(json_str), False
+        except json.JSONDecodeError:
+            pass
 
-    if open_braces > close_braces:
-        json_str += "}" * (open_braces - close_braces)
+    # 4️⃣ Structural parse (trailing commas, text after the object,
+    # truncation)
+    parser = IncrementalJSONParser()
+    parser.feed(cleaned[start:])
+    if not parser.done:
+        debug_log("⚠️ Missing closing brace, attempting recovery")
 
-    # 4️⃣ Final parse attempt
     try:
-        return json.loads(json_str)
+        return parser.result(), not parser.done
     except json.JSONDecodeError as e:
         debug_log("❌ JSON parsing failed")
         debug_log(f"Error: {e}")
         debug_log("Extracted JSON string:")
-        debug_log(json_str)
+        debug_log(json_str or cleaned[start:])
         raise
+
+
+def extract_json_from_text(text: str) -> dict:
+    return extract_json_with_status(text)[0]
@@ -0,0 +1,231 @@
+"""
+utils/json_stream.py
+--------------------
+Incremental JSON parser for streamed LLM output.
+
+Chunks are fed as they arrive. The parser tracks string / escape state
+and a stack of open containers, so it knows:
+- the moment the top-level object closes → stop reading the stream
+- on truncation, the last structurally safe cut point → repair
+
+Repair is structural, not brace counting:
+- an open string, an open *key*, a dangling ':' / ',' or a trailing
+  number / partial literal is cut back to the last complete element
+  (a truncated "dock" may have been "docker", "12" may have been "125")
+- a nested object that never closed is dropped whole, so a truncated
+  record never passes for a complete one
+- open arrays and the top-level object are closed in stack order
+
+A trailing comma before '}' / ']' ({"a": 1,}) is dropped.
+
+Text before the first '{' (```json fences, preambles) and after the
+top-level '}' is ignored.
+"""
+
+import json
+from typing import Iterable, List, Optional, Tuple
+
+from config.settings import debug_log
+
+_WHITESPACE = " \t\r\n"
+
+# Only these can be kept at a truncation point: nothing can extend them
+_LITERALS = {"true", "false", "null"}
+
+
+class IncrementalJSONParser:
+
+    def __init__(self):
+        self.buffer: List[str] = []
+        self.done = False
+        self.started = False
+
+        # Container stack: [kind, expect, cut] with kind '{' / '[', expect
+        # 'key' | 'colon' | 'value' | 'comma' and cut = the enclosing
+        # container's last complete prefix when this one opened
+        self._stack: List[list] = []
+        self._safe = 0              # buffer length of the last complete prefix
+
+        self._in_string = False
+        self._string_is_key = False
+        self._escape_at: Optional[int] = None
+        self._unicode_left = 0
+
+        self._scalar_start: Optional[int] = None
+
+    # ---------------------------------------------------------
+    # Feeding
+    # ---------------------------------------------------------
+
+    def feed(self, chunk: str) -> bool:
+        """Consumes a chunk. Returns True once the top-level object is closed."""
+        for ch in chunk:
+            if self.done:
+                break
+            if not self.started:
+                if ch == "{":
+                    self.started = True
+                    self._open("{")
+                continue
+            self._step(ch)
+        return self.done
+
+    def _pos(self) -> int:
+        return len(self.buffer)
+
+    def _open(self, kind: str) -> None:
+        cut = self._safe
+        self.buffer.append(kind)
+        self._stack.append([kind, "key" if kind == "{" else "value", cut])
+        self._safe = self._pos()
+
+    def _drop_trailing_comma(self) -> None:
+        i = len(self.buffer)
+        while i and self.buffer[i - 1] in _WHITESPACE:
+            i -= 1
+        if i and self.buffer[i - 1] == ",":
+            del self.buffer[i - 1:]
+
+    def _value_done(self) -> None:
+        """A complete value just ended at the current buffer position."""
+        if not self._stack:
+            return
+        self._stack[-1][1] = "comma"
+        self._safe = self._pos()
+
+    def _end_scalar(self) -> None:
+        if self._scalar_start is not None:
+            self._scalar_start = None
+            self._value_done()
+
+    def _step(self, ch: str) -> None:
+        if self._in_string:
+            self.buffer.append(ch)
+            if self._unicode_left:
+                self._unicode_left -= 1
+                if not self._unicode_left:
+                    self._escape_at = None
+            elif self._escape_at is not None:
+                if ch == "u":
+                    self._unicode_left = 4
+                else:
+                    self._escape_at = None
+            elif ch == "\\":
+                self._escape_at = self._pos() - 1
+            elif ch == '"':
+                self._in_string = False
+                if self._string_is_key:
+                    self._stack[-1][1] = "colon"
+                else:
+                    self._value_done()
+            return
+
+        if ch in _WHITESPACE:
+            self._end_scalar()
+            self.buffer.append(ch)
+            return
+
+        if ch == '"':
+            self._in_string = True
+            self._string_is_key = self._stack[-1][0] == "{" and self._stack[-1][1] == "key"
+            self.buffer.append(ch)
+        elif ch in "{[":
+            self._open(ch)
+        elif ch in "}]":
+            self._end_scalar()
+            self._drop_trailing_comma()
+            self.buffer.append(ch)
+            self._stack.pop()
+            if self._stack:
+                self._value_done()
+            else:
+                self._safe = self._pos()
+                self.done = True
+        elif ch == ":":
+            self._stack[-1][1] = "value"
+            self.buffer.append(ch)
+        elif ch == ",":
+            self._end_scalar()
+            self._stack[-1][1] = "key" if self._stack[-1][0] == "{" else "value"
+            self.buffer.append(ch)
+        else:
+            if self._scalar_start is None:
+                self._scalar_start = self._pos()
+            self.buffer.append(ch)
+
+    # ---------------------------------------------------------
+    # Results
+    # ---------------------------------------------------------
+
+    @property
+    def text(self) -> str:
+        return "".join(self.buffer)
+
+    def repaired_text(self) -> str:
+        """Complete JSON text: the full object, or a structural repair."""
+        if not self.started:
+            raise ValueError("No JSON object start found")
+        if self.done:
+            return self.text
+
+        buf = self.buffer
+        stack = self._stack
+
+        # Outermost unfinished nested object → cut back to before it
+        nested = next((i for i, (kind, _, _) in enumerate(stack) if i and kind == "{"), None)
+
+        if nested is not None:
+            head = "".join(buf[:stack[nested][2]])
+            stack = stack[:nested]
+        elif self._scalar_start is not None and "".join(buf[self._scalar_start:]) in _LITERALS:
+            head = "".join(buf)
+        else:
+            head = "".join(buf[:self._safe])
+
+        head = head.rstrip()
+        if head.endswith(","):
+            head = head[:-1]
+
+        closers = "".join("}" if kind == "{" else "]" for kind, _, _ in reversed(stack))
+        debug_log(f"⚠️ Truncated JSON repaired structurally (closed {len(stack)} container(s))")
+        return head + closers
+
+    def result(self) -> dict:
+        return json.loads(self.repaired_text())
+
+
+# ---------------------------------------------------------
+# Convenience helpers
+# ---------------------------------------------------------
+
+def iter_chunk_text(response) -> Iterable[str]:
+    """Text of each chunk of a streamed generate_content response."""
+    for chunk in response:
+        try:
+            text = chunk.text
+        except (AttributeError, ValueError):
+            # Chunks without text parts (e.g. safety / finish metadata)
+            parts = getattr(chunk, "parts", None) or []
+            text = "".join(getattr(p, "text", "") for p in parts)
+        if text:
+            yield text
+
+
+def repair_json(text: str) -> dict:
+    """Parses the first JSON object in text, repairing truncation."""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.result()
+
+
+def read_json_stream(chunks: Iterable[str]) -> Tuple[str, bool]:
+    """
+    Feeds chunks until the top-level object closes (remaining chunks are
+    not consumed). Returns (json_text, complete); incomplete streams come
+    back structurally repaired.
+    """
+    parser = IncrementalJSONParser()
+    for chunk in chunks:
+        if parser.feed(chunk):
+            break
+    return parser.repaired_text(), parser.done
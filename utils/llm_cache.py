@@ -0,0 +1,242 @@
+"""
+utils/llm_cache.py
+------------------
+Persistent, content-addressed cache for LLM responses.
+
+Keys are a SHA-256 of (model name, prompt text, generation config),
+so a byte-identical request never goes back to Gemini.
+
+Storage:
+- Single SQLite file (safe across threads and processes)
+- TTL-based expiry + max-entry eviction (least recently used first)
+- Hit / miss counters for observability
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config.settings import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    debug_log
+)
+
+
+# ---------------------------------------------------------
+# Cache key
+# ---------------------------------------------------------
+
+def make_cache_key(model_name: str, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "prompt": prompt,
+            "generation_config": generation_config or {}
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------
+# SQLite-backed cache
+# ---------------------------------------------------------
+
+class LLMCache:
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: Optional[float] = LLM_CACHE_TTL_SECONDS,
+        max_entries: Optional[int] = LLM_CACHE_MAX_ENTRIES
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)"
+        )
+        self._conn.commit()
+
+    # ---------------------------------------------------------
+    # Lookup / store
+    # ---------------------------------------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is not None and self._is_expired(row[1], now):
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        debug_log(f"LLM cache hit: {key[:12]}")
+        return row[0]
+
+    def set(self, key: str, model_name: str, response: str) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, model_name, response, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    # ---------------------------------------------------------
+    # Invalidation
+    # ---------------------------------------------------------
+
+    def invalidate(self, key: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+        return cur.rowcount > 0
+
+    def clear(self, model_name: Optional[str] = None) -> int:
+        with self._lock:
+            if model_name is None:
+                cur = self._conn.execute("DELETE FROM llm_cache")
+            else:
+                cur = self._conn.execute("DELETE FROM llm_cache WHERE model = ?", (model_name,))
+            self._conn.commit()
+        debug_log(f"LLM cache cleared ({cur.rowcount} entries)")
+        return cur.rowcount
+
+    # ---------------------------------------------------------
+    # Stats
+    # ---------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": size
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and (now - created_at) > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?",
+                (now - self.ttl_seconds,)
+            )
+
+        if self.max_entries is not None:
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache
+                    ORDER BY last_access DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+
+# ---------------------------------------------------------
+# Shared instance used by the analyzers
+# ---------------------------------------------------------
+
+_CACHE: Optional[LLMCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Returns the process-wide cache, or None when caching is disabled
+    (LLM_CACHE_ENABLED = False or MATCHMYJD_NO_CACHE=1).
+    """
+    global _CACHE
+
+    if not LLM_CACHE_ENABLED or os.environ.get("MATCHMYJD_NO_CACHE") == "1":
+        return None
+
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = LLMCache()
+    return _CACHE
+
+
+# ---------------------------------------------------------
+# CLI: inspect / invalidate
+# ---------------------------------------------------------
+
+if __name__ == "__main__":
+    """
+    python -m utils.llm_cache          → print stats
+    python -m utils.llm_cache clear    → drop all entries
+    """
+    import sys
+
+    cache = LLMCache()
+    if len(sys.argv) > 1 and sys.argv[1] == "clear":
+        print(f"Removed {cache.clear()} entries")
+    else:
+        print(json.dumps(cache.stats(), indent=2))
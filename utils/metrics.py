@@ -0,0 +1,75 @@
+"""
+utils/metrics.py
+----------------
+Process-wide metrics for the LLM path. Cheap enough to touch on every call.
+
+- counters   increment("jd.retries")            calls, retries, failures
+- gauges     set_gauge("llm.queue_depth", 3)    current values
+- summaries  observe("llm.wait_seconds", 0.4)   count / mean / max
+
+Read with snapshot() or log_metrics().
+"""
+
+import threading
+from collections import Counter
+from typing import Dict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_COUNTERS: Counter = Counter()
+_GAUGES: Dict[str, float] = {}
+_SUMMARIES: Dict[str, Dict[str, float]] = {}
+_LOCK = threading.Lock()
+
+
+def increment(name: str, n: int = 1) -> None:
+    with _LOCK:
+        _COUNTERS[name] += n
+
+
+def get(name: str) -> int:
+    with _LOCK:
+        return _COUNTERS[name]
+
+
+def set_gauge(name: str, value: float) -> None:
+    with _LOCK:
+        _GAUGES[name] = value
+
+
+def observe(name: str, value: float) -> None:
+    with _LOCK:
+        s = _SUMMARIES.get(name)
+        if s is None:
+            _SUMMARIES[name] = {"count": 1, "sum": value, "max": value}
+        else:
+            s["count"] += 1
+            s["sum"] += value
+            s["max"] = max(s["max"], value)
+
+
+def snapshot() -> Dict[str, float]:
+    """Counters, gauges and summaries (as name.count / name.mean / name.max)."""
+    with _LOCK:
+        out: Dict[str, float] = dict(_COUNTERS)
+        out.update(_GAUGES)
+        for name, s in _SUMMARIES.items():
+            out[f"{name}.count"] = s["count"]
+            out[f"{name}.mean"] = round(s["sum"] / s["count"], 4)
+            out[f"{name}.max"] = round(s["max"], 4)
+    return dict(sorted(out.items()))
+
+
+def reset() -> None:
+    with _LOCK:
+        _COUNTERS.clear()
+        _GAUGES.clear()
+        _SUMMARIES.clear()
+
+
+def log_metrics(prefix: str = "") -> None:
+    values = {k: v for k, v in snapshot().items() if k.startswith(prefix)}
+    if values:
+        logger.info("📊 " + ", ".join(f"{k}={v}" for k, v in values.items()))
@@ -0,0 +1,225 @@
+"""
+utils/schema.py
+---------------
+JSON schemas from schemas/*.json, loaded and compiled once.
+
+- load_schema(name)          parsed schema (cached)
+- to_response_schema(schema) Gemini structured-output schema: the
+                             OpenAPI subset Gemini accepts (no $schema,
+                             title, additionalProperties; upper-case types)
+- get_validator(name)        precompiled validator → list of error strings
+- coerce_to_schema(name, v)  best-effort repair of an invalid instance
+
+The validator covers what our schemas use: type, required, properties,
+additionalProperties (bool or schema), items and enum.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+SCHEMA_DIR = Path(__file__).resolve().parent.parent / "schemas"
+
+_RESPONSE_SCHEMA_KEYS = {"type", "properties", "required", "items", "enum", "description", "nullable", "format"}
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+Validator = Callable[[Any], List[str]]
+
+
+# ---------------------------------------------------------
+# Loading
+# ---------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _load_schema_text(schema_name: str) -> str:
+    with open(SCHEMA_DIR / schema_name, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_schema(schema_name: str) -> dict:
+    # Fresh dict per call so callers may mutate it
+    return json.loads(_load_schema_text(schema_name))
+
+
+# ---------------------------------------------------------
+# Gemini response schema
+# ---------------------------------------------------------
+
+def to_response_schema(schema: dict) -> dict:
+    out = {}
+    for key, value in schema.items():
+        if key not in _RESPONSE_SCHEMA_KEYS:
+            continue
+        if key == "type":
+            out[key] = value.upper()
+        elif key == "properties":
+            out[key] = {name: to_response_schema(sub) for name, sub in value.items()}
+        elif key == "items":
+            out[key] = to_response_schema(value)
+        else:
+            out[key] = value
+    return out
+
+
+@lru_cache(maxsize=None)
+def _response_schema_text(schema_name: str) -> str:
+    return json.dumps(to_response_schema(load_schema(schema_name)))
+
+
+def response_schema(schema_name: str) -> dict:
+    return json.loads(_response_schema_text(schema_name))
+
+
+# ---------------------------------------------------------
+# Precompiled validator
+# ---------------------------------------------------------
+
+def compile_validator(schema: dict) -> Validator:
+    """Turns a schema into nested closures once; calls are then cheap."""
+    checks: List[Callable[[Any, str, List[str]], None]] = []
+
+    expected = schema.get("type")
+    if expected:
+        type_ok = _TYPE_CHECKS[expected]
+
+        def check_type(v, path, errors):
+            if not type_ok(v):
+                errors.append(f"{path}: expected {expected}, got {type(v).__name__}")
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(v, path, errors):
+            if v not in allowed:
+                errors.append(f"{path}: {v!r} not in {allowed}")
+        checks.append(check_enum)
+
+    if expected == "object" or "properties" in schema:
+        required = list(schema.get("required", []))
+        props = {name: compile_validator(sub) for name, sub in schema.get("properties", {}).items()}
+        extra = schema.get("additionalProperties", True)
+        extra_check = compile_validator(extra) if isinstance(extra, dict) else None
+
+        def check_object(v, path, errors):
+            if not isinstance(v, dict):
+                return
+            for name in required:
+                if name not in v:
+                    errors.append(f"{path}: missing required '{name}'")
+            for name, value in v.items():
+                if name in props:
+                    errors.extend(props[name](value, f"{path}.{name}"))
+                elif extra is False:
+                    errors.append(f"{path}: unexpected property '{name}'")
+                elif extra_check is not None:
+                    errors.extend(extra_check(value, f"{path}.{name}"))
+        checks.append(check_object)
+
+    if "items" in schema:
+        item_check = compile_validator(schema["items"])
+
+        def check_items(v, path, errors):
+            if not isinstance(v, list):
+                return
+            for i, item in enumerate(v):
+                errors.extend(item_check(item, f"{path}[{i}]"))
+        checks.append(check_items)
+
+    def validate(instance: Any, path: str = "$") -> List[str]:
+        errors: List[str] = []
+        for check in checks:
+            check(instance, path, errors)
+        return errors
+
+    return validate
+
+
+@lru_cache(maxsize=None)
+def get_validator(schema_name: str) -> Validator:
+    return compile_validator(load_schema(schema_name))
+
+
+# ---------------------------------------------------------
+# Lenient coercion
+# ---------------------------------------------------------
+
+_DROP = object()
+
+
+def _empty(schema: dict):
+    return {"array": [], "object": {}}.get(schema.get("type"), _DROP)
+
+
+def _coerce(value: Any, schema: dict) -> Any:
+    expected = schema.get("type")
+
+    if expected == "array":
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            return _DROP
+        item_schema = schema.get("items", {})
+        items = (_coerce(v, item_schema) for v in value)
+        return [v for v in items if v is not _DROP]
+
+    if expected == "object" or "properties" in schema:
+        if not isinstance(value, dict):
+            return _DROP
+        props = schema.get("properties", {})
+        extra = schema.get("additionalProperties", True)
+        out = {}
+        for name, v in value.items():
+            if name in props:
+                v = _coerce(v, props[name])
+            elif extra is False:
+                continue
+            elif isinstance(extra, dict):
+                v = _coerce(v, extra)
+            if v is not _DROP:
+                out[name] = v
+        for name in schema.get("required", []):
+            if name not in out and name in props:
+                default = _empty(props[name])
+                if default is not _DROP:
+                    out[name] = default
+        return out
+
+    if expected == "string" and isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+
+    if expected and not _TYPE_CHECKS[expected](value):
+        return _DROP
+
+    if "enum" in schema and value not in schema["enum"]:
+        # "Senior" / "mid-level" → "senior" / "mid"
+        text = str(value).strip().lower()
+        value = next((e for e in schema["enum"] if isinstance(e, str) and e in text), _DROP)
+
+    return value
+
+
+def coerce_to_schema(schema_name: str, instance: Any) -> Any:
+    """
+    Best-effort repair of an instance that failed validation: a bare
+    string becomes a one-item list, values of the wrong type, unknown
+    properties and enum misses are dropped, and missing required
+    lists / objects are filled in empty. A required scalar that cannot
+    be repaired stays missing.
+
+    Raises ValueError if the instance itself has the wrong type.
+    """
+    coerced = _coerce(instance, load_schema(schema_name))
+    if coerced is _DROP:
+        raise ValueError(f"Cannot coerce {type(instance).__name__} to {schema_name}")
+    return coerced
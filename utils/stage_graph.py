@@ -0,0 +1,129 @@
+"""
+utils/stage_graph.py
+--------------------
+Minimal dependency-graph executor for pipeline stages.
+
+Each stage is a named function whose keyword arguments are the
+outputs of the stages it depends on (plus any run-time inputs).
+Independent stages run concurrently on a thread pool; a stage starts
+as soon as all of its dependencies have finished. Stages run in a copy
+of the caller's context, so context variables (e.g. llm_priority) set
+around run() apply inside them.
+
+Example:
+    graph = StageGraph()
+    graph.add("a", load_a)
+    graph.add("b", load_b)
+    graph.add("c", combine, deps=["a", "b"])
+    results = graph.run()
+"""
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Stage:
+
+    def __init__(self, name: str, fn: Callable[..., Any], deps: Optional[List[str]] = None):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps or [])
+
+
+class StageGraph:
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+
+    # ---------------------------------------------------------
+    # Graph construction
+    # ---------------------------------------------------------
+
+    def add(self, name: str, fn: Callable[..., Any], deps: Optional[List[str]] = None) -> "StageGraph":
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = Stage(name, fn, deps)
+        return self
+
+    def _validate(self, inputs: Dict[str, Any]) -> None:
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages and dep not in inputs:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown '{dep}'")
+
+        # Cycle detection (Kahn)
+        indegree = {
+            name: sum(1 for d in s.deps if d in self.stages)
+            for name, s in self.stages.items()
+        }
+        ready = [n for n, d in indegree.items() if d == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for s in self.stages.values():
+                if current in s.deps:
+                    indegree[s.name] -= 1
+                    if indegree[s.name] == 0:
+                        ready.append(s.name)
+
+        if visited != len(self.stages):
+            raise ValueError("Stage graph contains a cycle")
+
+    # ---------------------------------------------------------
+    # Execution
+    # ---------------------------------------------------------
+
+    def run(self, inputs: Optional[Dict[str, Any]] = None, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Executes every stage and returns {stage_name: output}
+        (run-time inputs are included as well).
+        The first stage failure cancels pending stages and is re-raised.
+        """
+        inputs = dict(inputs or {})
+        self._validate(inputs)
+
+        results: Dict[str, Any] = dict(inputs)
+        timings: Dict[str, float] = {}
+        pending = dict(self.stages)
+        running = {}
+
+        def _call(stage: Stage):
+            start = time.perf_counter()
+            output = stage.fn(**{d: results[d] for d in stage.deps})
+            timings[stage.name] = time.perf_counter() - start
+            return output
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(d in results for d in stage.deps):
+                        ctx = contextvars.copy_context()
+                        running[pool.submit(ctx.run, _call, stage)] = name
+                        del pending[name]
+
+                if not running:
+                    raise RuntimeError(f"Unresolvable stages: {list(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        for f in running:
+                            f.cancel()
+                        logger.error(f"Stage '{name}' failed")
+                        raise
+
+        logger.info(
+            "Stage timings: " +
+            ", ".join(f"{n}={t:.2f}s" for n, t in timings.items())
+        )
+        return results